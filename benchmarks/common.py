@@ -0,0 +1,111 @@
+"""Home Assistant setup shared by the benchmarks."""
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+import logging
+import tempfile
+from typing import Any, cast
+
+from custom_components.template_media_player import media_player
+from custom_components.template_media_player.const import CONF_MEDIA_PLAYERS, DOMAIN
+from custom_components.template_media_player.media_player import (
+    PLATFORM_SCHEMA,
+    TemplateMediaPlayer,
+)
+from homeassistant import loader
+from homeassistant.bootstrap import async_load_base_functionality
+from homeassistant.components.media_player import MediaPlayerEntity
+from homeassistant.components.media_player.const import (
+    DOMAIN as MEDIA_PLAYER_DOMAIN,
+    MediaPlayerEntityFeature,
+    MediaPlayerState,
+)
+from homeassistant.config_entries import ConfigEntries
+from homeassistant.const import CONF_PLATFORM
+from homeassistant.core import CoreState, HomeAssistant
+from homeassistant.helpers.entity_component import (
+    DEFAULT_SCAN_INTERVAL,
+    EntityComponent,
+)
+from homeassistant.helpers.entity_platform import EntityPlatform, EntityPlatformModule
+
+_LOGGER = logging.getLogger(__name__)
+
+BASE_ENTITY_ID = "media_player.base"
+
+
+class FakeMediaPlayer(MediaPlayerEntity):
+    """Base media player that accepts every command without doing anything."""
+
+    _attr_name = "Base"
+    _attr_state = MediaPlayerState.PLAYING
+    _attr_supported_features = (
+        MediaPlayerEntityFeature.PLAY
+        | MediaPlayerEntityFeature.PAUSE
+        | MediaPlayerEntityFeature.SELECT_SOURCE
+        | MediaPlayerEntityFeature.VOLUME_SET
+    )
+
+    def __init__(self) -> None:
+        """Initialize the fake media player."""
+        self._attr_source_list = ["TV", "Radio", "Streaming"]
+
+    async def async_media_play(self) -> None:
+        """Play media."""
+
+    async def async_media_pause(self) -> None:
+        """Pause media."""
+
+
+@asynccontextmanager
+async def async_hass(
+    *entities: MediaPlayerEntity,
+) -> AsyncIterator[HomeAssistant]:
+    """Run a Home Assistant core with its registries and the given media players.
+
+    The media players are added to the entity component of the media player
+    domain, the same way the media player integration adds the entities of its
+    platforms, so the template media players can look them up.
+    """
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        hass.config_entries = ConfigEntries(hass, {})
+        loader.async_setup(hass)
+        await async_load_base_functionality(hass)
+        hass.set_state(CoreState.running)
+
+        component = EntityComponent[MediaPlayerEntity](
+            _LOGGER, MEDIA_PLAYER_DOMAIN, hass
+        )
+        hass.data[MEDIA_PLAYER_DOMAIN] = component
+        await component.async_add_entities(entities)
+
+        try:
+            yield hass
+        finally:
+            await hass.async_stop(force=True)
+
+
+async def async_setup_players(
+    hass: HomeAssistant, media_players: dict[str, dict[str, Any]]
+) -> tuple[EntityPlatform, list[TemplateMediaPlayer]]:
+    """Set up the template media players through their entity platform."""
+    platform = EntityPlatform(
+        hass=hass,
+        logger=_LOGGER,
+        domain=MEDIA_PLAYER_DOMAIN,
+        platform_name=DOMAIN,
+        platform=cast(EntityPlatformModule, media_player),
+        scan_interval=DEFAULT_SCAN_INTERVAL,
+        entity_namespace=None,
+    )
+    await platform.async_setup(
+        PLATFORM_SCHEMA({CONF_PLATFORM: DOMAIN, CONF_MEDIA_PLAYERS: media_players})
+    )
+    await hass.async_block_till_done()
+
+    return platform, [
+        entity
+        for entity in platform.entities.values()
+        if isinstance(entity, TemplateMediaPlayer)
+    ]
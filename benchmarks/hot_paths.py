@@ -0,0 +1,346 @@
+"""Benchmark the hot paths of the template media player.
+
+Sets the players up through their entity platform on a running Home Assistant
+core with a fake base media player, and measures for each number of players:
+
+- setup of the players, including adding them to Home Assistant
+- rendering of the state and attribute templates per upstream state change
+- the same attributes copied from the base media player with passthrough
+- the supported features, state and source list properties
+- the precomputed supported features compared with computing them per access
+- command dispatch through a service script and through the base media player
+- rendering per upstream state change of a player whose attribute templates
+  use a global template, for each global template size and attribute count,
+  compared with the global template prepended to each attribute template
+
+Run from the repository root with Home Assistant installed:
+
+    python -m benchmarks.hot_paths --players 1 100 1000 --output results.json \
+        --global-variables 1 10 50 --attributes 1 10 50
+"""
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+from functools import partial
+import json
+import logging
+from pathlib import Path
+import platform
+import statistics
+import time
+from typing import Any
+
+from benchmarks.common import (
+    BASE_ENTITY_ID,
+    FakeMediaPlayer,
+    async_hass,
+    async_setup_players,
+)
+from custom_components.template_media_player.media_player import TemplateMediaPlayer
+from homeassistant.components.media_player.const import MediaPlayerState
+from homeassistant.const import __version__ as HA_VERSION
+from homeassistant.core import HomeAssistant
+
+MANIFEST = Path("custom_components/template_media_player/manifest.json")
+
+SUPPORTED_FEATURES_ACCESSES = 100
+
+
+def _player_config(scripts: bool, passthrough: bool = False) -> dict[str, Any]:
+    """Return the configuration of a single player."""
+    config: dict[str, Any] = {
+        "base_media_player_entity_id": BASE_ENTITY_ID,
+        "state": f"{{{{ states('{BASE_ENTITY_ID}') }}}}",
+    }
+
+    if passthrough:
+        config["passthrough_attributes"] = True
+    else:
+        config["attributes"] = {
+            attribute: f"{{{{ state_attr('{BASE_ENTITY_ID}', '{attribute}') }}}}"
+            for attribute in ("media_title", "media_artist", "volume_level")
+        }
+
+    if scripts:
+        config["service_scripts"] = {
+            "media_play": [{"variables": {"command": "play"}}],
+            "media_pause": [{"variables": {"command": "pause"}}],
+        }
+
+    return config
+
+
+def _player_configs(
+    players: int, scripts: bool, passthrough: bool = False
+) -> dict[str, dict[str, Any]]:
+    """Return the configurations of the given number of players."""
+    return {
+        f"player_{player}": _player_config(scripts, passthrough)
+        for player in range(players)
+    }
+
+
+def _global_template(variables: int) -> str:
+    """Return a global template setting the given number of variables."""
+    return "".join(
+        f"{{% set var_{variable} = state_attr('{BASE_ENTITY_ID}', 'media_title') "
+        f"~ ' {variable}' %}}"
+        for variable in range(variables)
+    )
+
+
+def _global_template_config(
+    variables: int, attributes: int, prepended: bool
+) -> dict[str, dict[str, Any]]:
+    """Return the configuration of a player using a global template.
+
+    If prepended, the global template is copied in front of each attribute
+    template instead, as it was rendered before it was shared.
+    """
+    global_template = _global_template(variables)
+    prefix = global_template if prepended else ""
+    config: dict[str, Any] = {
+        "state": f"{{{{ states('{BASE_ENTITY_ID}') }}}}",
+        "attributes": {
+            f"attribute_{attribute}": (f"{prefix}{{{{ var_{attribute % variables} }}}}")
+            for attribute in range(attributes)
+        },
+    }
+
+    if not prepended:
+        config["global_template"] = global_template
+
+    return {"player": config}
+
+
+async def _async_time(target: Callable[[], Awaitable[Any]], repeat: int) -> list[float]:
+    """Return the durations of repeated runs of a target in seconds."""
+    durations: list[float] = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await target()
+        durations.append(time.perf_counter() - start)
+
+    return durations
+
+
+async def _async_change_base(hass: HomeAssistant) -> None:
+    """Change the attributes of the base media player and wait for all renders."""
+    hass.states.async_set(
+        BASE_ENTITY_ID,
+        MediaPlayerState.PLAYING,
+        {"media_title": f"Title {time.perf_counter_ns()}", "volume_level": 0.5},
+    )
+    await hass.async_block_till_done()
+
+
+def _supported_features(entities: list[TemplateMediaPlayer], accesses: int) -> None:
+    """Read the precomputed supported features of all players."""
+    for entity in entities:
+        for _ in range(accesses):
+            _ = entity.supported_features
+
+
+def _computed_supported_features(
+    entities: list[TemplateMediaPlayer], accesses: int
+) -> None:
+    """Compute the supported features of all players on each access."""
+    for entity in entities:
+        for _ in range(accesses):
+            _ = (
+                entity._get_script_supported_features()
+                | entity._get_base_supported_features()
+            )
+
+
+async def _async_dispatch(entities: list[TemplateMediaPlayer]) -> None:
+    """Send a play command to all players."""
+    for entity in entities:
+        await entity.async_media_play()
+
+
+def _result(
+    benchmark: str, players: int, durations: list[float], operations: int
+) -> dict[str, Any]:
+    """Return the summary of a benchmark run."""
+    per_operation = [duration / operations for duration in durations]
+
+    return {
+        "benchmark": benchmark,
+        "players": players,
+        "runs": len(durations),
+        "operations": operations,
+        "mean_us": statistics.fmean(per_operation) * 1e6,
+        "median_us": statistics.median(per_operation) * 1e6,
+        "min_us": min(per_operation) * 1e6,
+    }
+
+
+async def _async_benchmark(players: int, repeat: int) -> list[dict[str, Any]]:
+    """Run all benchmarks for a number of players."""
+    results: list[dict[str, Any]] = []
+
+    async with async_hass(FakeMediaPlayer()) as hass:
+
+        async def setup() -> None:
+            platform, _ = await async_setup_players(
+                hass, _player_configs(players, True)
+            )
+            await platform.async_reset()
+
+        results.append(
+            _result("setup", players, await _async_time(setup, repeat), players)
+        )
+
+    async with async_hass(FakeMediaPlayer()) as hass:
+        _, scripted = await async_setup_players(hass, _player_configs(players, True))
+        results.append(
+            _result(
+                "render_per_change",
+                players,
+                await _async_time(partial(_async_change_base, hass), repeat),
+                1,
+            )
+        )
+
+        async def properties() -> None:
+            for entity in scripted:
+                _ = entity.supported_features
+                _ = entity.state
+                _ = entity.source_list
+
+        results.append(
+            _result(
+                "properties", players, await _async_time(properties, repeat), players
+            )
+        )
+        for benchmark, target in (
+            ("supported_features", _supported_features),
+            ("computed_supported_features", _computed_supported_features),
+        ):
+
+            async def access(target: Callable[..., None] = target) -> None:
+                target(scripted, SUPPORTED_FEATURES_ACCESSES)
+
+            results.append(
+                _result(
+                    benchmark,
+                    players,
+                    await _async_time(access, repeat),
+                    players * SUPPORTED_FEATURES_ACCESSES,
+                )
+            )
+        results.append(
+            _result(
+                "dispatch_script",
+                players,
+                await _async_time(partial(_async_dispatch, scripted), repeat),
+                players,
+            )
+        )
+
+    async with async_hass(FakeMediaPlayer()) as hass:
+        _, fallback = await async_setup_players(hass, _player_configs(players, False))
+        results.append(
+            _result(
+                "dispatch_base",
+                players,
+                await _async_time(partial(_async_dispatch, fallback), repeat),
+                players,
+            )
+        )
+
+    async with async_hass(FakeMediaPlayer()) as hass:
+        await async_setup_players(hass, _player_configs(players, False, True))
+        results.append(
+            _result(
+                "passthrough_per_change",
+                players,
+                await _async_time(partial(_async_change_base, hass), repeat),
+                1,
+            )
+        )
+
+    return results
+
+
+async def _async_benchmark_global_template(
+    variables: int, attributes: int, repeat: int
+) -> list[dict[str, Any]]:
+    """Run the global template benchmarks for a size and attribute count."""
+    results: list[dict[str, Any]] = []
+
+    for benchmark, prepended in (
+        ("global_template_per_change", False),
+        ("prepended_global_per_change", True),
+    ):
+        async with async_hass(FakeMediaPlayer()) as hass:
+            await async_setup_players(
+                hass, _global_template_config(variables, attributes, prepended)
+            )
+            result = _result(
+                benchmark,
+                1,
+                await _async_time(partial(_async_change_base, hass), repeat),
+                1,
+            )
+            result["global_variables"] = variables
+            result["attributes"] = attributes
+            results.append(result)
+
+    return results
+
+
+async def async_main() -> None:
+    """Run the benchmarks and write the results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--players", type=int, nargs="+", default=[1, 100, 1000])
+    parser.add_argument("--global-variables", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--attributes", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", type=Path, default=Path("benchmark.json"))
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    results: list[dict[str, Any]] = []
+    for players in args.players:
+        results.extend(await _async_benchmark(players, args.repeat))
+
+    for variables in args.global_variables:
+        for attributes in args.attributes:
+            results.extend(
+                await _async_benchmark_global_template(
+                    variables, attributes, args.repeat
+                )
+            )
+
+    for result in results:
+        label = (
+            f"{result['global_variables']:>3} variables {result['attributes']:>3} "
+            "attributes"
+            if "global_variables" in result
+            else f"{result['players']:>5} players"
+        )
+        print(
+            f"{result['benchmark']:>28} {label}: "
+            f"{result['median_us']:10.2f} us median per operation"
+        )
+
+    args.output.write_text(
+        json.dumps(
+            {
+                "version": json.loads(MANIFEST.read_text())["version"],
+                "homeassistant": HA_VERSION,
+                "python": platform.python_version(),
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(async_main())
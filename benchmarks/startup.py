@@ -0,0 +1,115 @@
+"""Benchmark the setup time and memory of template media players.
+
+Compares building the scripts of each player lazily on first use with building
+all of them up front, as done with the `warm_up_scripts` option.
+
+Run from the repository root with Home Assistant installed:
+
+    python -m benchmarks.startup --players 100 --sources 30
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+import tracemalloc
+from typing import Any
+
+from benchmarks.common import (
+    BASE_ENTITY_ID,
+    FakeMediaPlayer,
+    async_hass,
+    async_setup_players,
+)
+from custom_components.template_media_player.media_player import TemplateMediaPlayer
+
+SERVICES = (
+    "media_next_track",
+    "media_pause",
+    "media_play",
+    "media_play_pause",
+    "media_previous_track",
+    "media_seek",
+    "media_stop",
+    "turn_on",
+    "turn_off",
+    "volume_down",
+    "volume_mute",
+    "volume_set",
+    "volume_up",
+)
+
+
+def _sequence(service: str, **data: Any) -> list[dict[str, Any]]:
+    """Return an action sequence calling a service of the base player."""
+    return [
+        {
+            "action": f"media_player.{service}",
+            "target": {"entity_id": BASE_ENTITY_ID},
+            "data": data,
+        }
+    ]
+
+
+def _media_player_configs(players: int, sources: int) -> dict[str, Any]:
+    """Return the configurations of the given number of players."""
+    return {
+        f"player_{player}": {
+            "state": f"{{{{ states('{BASE_ENTITY_ID}') }}}}",
+            "service_scripts": {service: _sequence(service) for service in SERVICES},
+            "source_scripts": {
+                f"Source {source}": _sequence(
+                    "select_source", source=f"Source {source}"
+                )
+                for source in range(sources)
+            },
+        }
+        for player in range(players)
+    }
+
+
+async def _async_setup(
+    configs: dict[str, Any], eager: bool
+) -> tuple[float, int, list[TemplateMediaPlayer]]:
+    """Set up the players and return the time taken and memory allocated."""
+    async with async_hass(FakeMediaPlayer()) as hass:
+        tracemalloc.start()
+        start = time.perf_counter()
+
+        _, entities = await async_setup_players(hass, configs)
+
+        if eager:
+            for entity in entities:
+                entity._service_scripts.warm_up()
+                entity._source_scripts.warm_up()
+                entity._sound_mode_scripts.warm_up()
+
+        duration = time.perf_counter() - start
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return duration, memory, entities
+
+
+async def async_main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--players", type=int, default=100)
+    parser.add_argument("--sources", type=int, default=30)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    configs = _media_player_configs(args.players, args.sources)
+
+    for mode, eager in (("lazy", False), ("eager", True)):
+        duration, memory, _ = await _async_setup(configs, eager)
+        print(
+            f"{mode:>5}: {duration * 1000:8.2f} ms total, "
+            f"{duration * 1000 / args.players:6.3f} ms "
+            f"and {memory / 1024 / args.players:8.1f} KiB per player"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(async_main())
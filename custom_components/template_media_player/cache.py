@@ -0,0 +1,98 @@
+"""Caches for the Template Media Player integration."""
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Callable, Coroutine, Hashable
+from datetime import timedelta
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+
+class TTLCache[K: Hashable, V]:
+    """Bounded cache whose entries expire after a fixed time to live.
+
+    When the cache is full the least recently used entry is evicted. Lookups are
+    counted as hits or misses, so the effectiveness of the cache can be
+    inspected.
+    """
+
+    def __init__(self, max_size: int, ttl: timedelta) -> None:
+        """Initialize the cache."""
+        self.max_size = max_size
+        self.ttl = ttl.total_seconds()
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._entries)
+
+    def __contains__(self, key: K) -> bool:
+        """Return whether an unexpired entry exists, without counting a lookup."""
+        entry = self._entries.get(key)
+        return entry is not None and entry[0] > time.monotonic()
+
+    def get(self, key: K) -> V | None:
+        """Return the cached value for a key if it has not expired."""
+        if (entry := self._entries.get(key)) is None:
+            self.misses += 1
+            return None
+
+        expires, value = entry
+
+        if expires <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        """Cache a value for a key, evicting the least recently used entry."""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return the hit and miss counts and the size of the cache."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self)}
+
+
+class SingleFlight[K: Hashable, V]:
+    """Share a single in-flight call between concurrent callers with the same key."""
+
+    def __init__(self, hass: HomeAssistant, name: str) -> None:
+        """Initialize the single flight group."""
+        self.hass = hass
+        self.name = name
+        self.calls = 0
+        self.shared = 0
+        self._tasks: dict[K, asyncio.Task[V]] = {}
+
+    async def async_call(
+        self, key: K, target: Callable[[], Coroutine[Any, Any, V]]
+    ) -> V:
+        """Run the target for a key or wait for the run already in flight."""
+        self.calls += 1
+
+        if (task := self._tasks.get(key)) is None:
+            task = self._tasks[key] = self.hass.async_create_task(
+                target(), f"{self.name} {key}", eager_start=True
+            )
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        else:
+            self.shared += 1
+
+        return await asyncio.shield(task)
@@ -0,0 +1,114 @@
+"""Command coalescing for the Template Media Player integration."""
+
+import asyncio
+from collections.abc import Callable, Coroutine
+from datetime import datetime, timedelta
+import logging
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+_LOGGER = logging.getLogger(__name__)
+
+type CoalescerAction = Callable[[dict[str, Any]], Coroutine[Any, Any, None]]
+type CoalescerMerge = Callable[[dict[str, Any], dict[str, Any]], dict[str, Any]]
+
+
+def merge_latest(pending: dict[str, Any], variables: dict[str, Any]) -> dict[str, Any]:
+    """Merge the variables of two calls by keeping the latest."""
+    return variables
+
+
+def merge_steps(pending: dict[str, Any], variables: dict[str, Any]) -> dict[str, Any]:
+    """Merge the variables of two calls by summing their steps."""
+    return {"steps": pending["steps"] + variables["steps"]}
+
+
+class CommandCoalescer:
+    """Merge bursts of calls to a service into a single run.
+
+    The first call opens a window, every call received while the window is open is
+    merged into the pending variables and the action is run once with the result
+    when the window closes or is flushed. All merged calls wait for that single run.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        name: str,
+        window: timedelta,
+        action: CoalescerAction,
+        merge: CoalescerMerge,
+    ) -> None:
+        """Initialize the command coalescer."""
+        self.hass = hass
+        self.name = name
+        self.window = window
+        self.received = 0
+        self.executed = 0
+        self._action = action
+        self._merge = merge
+        self._pending: dict[str, Any] | None = None
+        self._pending_calls = 0
+        self._future: asyncio.Future[asyncio.Task[None]] | None = None
+        self._unsub: CALLBACK_TYPE | None = None
+
+    async def async_call(self, variables: dict[str, Any]) -> None:
+        """Add a call to the current window and wait for it to be run."""
+        self.received += 1
+        self._pending_calls += 1
+
+        if self._pending is None or self._future is None:
+            self._pending = variables
+            self._future = self.hass.loop.create_future()
+            self._unsub = async_call_later(
+                self.hass, self.window, self._async_window_closed
+            )
+        else:
+            self._pending = self._merge(self._pending, variables)
+
+        task = await asyncio.shield(self._future)
+        await asyncio.shield(task)
+
+    @callback
+    def _async_window_closed(self, _now: datetime) -> None:
+        """Run the merged calls once the window has closed."""
+        self._unsub = None
+        self.async_flush()
+
+    @callback
+    def async_flush(self) -> None:
+        """Run the action with the merged variables of the window now."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+        variables, future, calls = self._pending, self._future, self._pending_calls
+        self._pending = None
+        self._future = None
+        self._pending_calls = 0
+
+        if variables is None or future is None:
+            return
+
+        self.executed += 1
+        _LOGGER.debug("Coalesced %s calls of %s into one run", calls, self.name)
+
+        future.set_result(
+            self.hass.async_create_task(self._action(variables), eager_start=True)
+        )
+
+    @callback
+    def async_cancel(self) -> None:
+        """Cancel the pending window."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+        if self._future is not None and not self._future.done():
+            self._future.cancel()
+
+        self._pending = None
+        self._future = None
+        self._pending_calls = 0
@@ -1,16 +1,42 @@
 """Constants for the Template Media Player integration."""
 
+DOMAIN = "template_media_player"
+
 CONF_MEDIA_PLAYERS = "media_players"
 CONF_BASE_MEDIA_PLAYER_ENTITY_ID = "base_media_player_entity_id"
 CONF_BROWSE_MEDIA_ENTITY_ID = "browse_media_entity_id"
 CONF_SEARCH_MEDIA_ENTITY_ID = "search_media_entity_id"
+CONF_BROWSE_CACHE = "browse_cache"
+CONF_SEARCH_CACHE = "search_cache"
+CONF_RESOLVE_CACHE = "resolve_cache"
+CONF_PRE_RESOLVE = "pre_resolve"
+CONF_TTL = "ttl"
+CONF_MAX_SIZE = "max_size"
 CONF_DEVICE_CLASS = "device_class"
 CONF_GLOBAL_TEMPLATE = "global_template"
+CONF_COMPUTED_VARIABLES = "computed_variables"
 CONF_STATE = "state"
 CONF_ATTRIBUTES = "attributes"
+CONF_BATCH_ATTRIBUTES = "batch_attributes"
+CONF_RATE_LIMIT = "rate_limit"
+CONF_ATTRIBUTE_RATE_LIMITS = "attribute_rate_limits"
+CONF_ENTITY_IDS = "entity_ids"
+CONF_NATIVE_POSITION = "native_position"
+CONF_OPTIMISTIC = "optimistic"
+CONF_OPTIMISTIC_TIMEOUT = "optimistic_timeout"
+CONF_PASSTHROUGH_ATTRIBUTES = "passthrough_attributes"
+CONF_UNRECORDED_ATTRIBUTES = "unrecorded_attributes"
+CONF_SUSPEND_STATES = "suspend_states"
 CONF_SERVICE_SCRIPTS = "service_scripts"
+CONF_SERVICE_OPTIONS = "service_options"
+CONF_COALESCE = "coalesce"
+CONF_BACKGROUND = "background"
+CONF_MODE = "mode"
+CONF_MAX = "max"
 CONF_SOUND_MODE_SCRIPTS = "sound_mode_scripts"
 CONF_SOURCE_SCRIPTS = "source_scripts"
+CONF_WARM_UP_SCRIPTS = "warm_up_scripts"
+CONF_STATISTICS = "statistics"
 CONF_MEDIA_NEXT_TRACK_SCRIPT = "media_next_track"
 CONF_MEDIA_PAUSE_SCRIPT = "media_pause"
 CONF_MEDIA_PLAY_SCRIPT = "media_play"
@@ -31,9 +57,20 @@ CONF_CLEAR_PLAYLIST_SCRIPT = "clear_playlist"
 CONF_JOIN_SCRIPT = "join"
 CONF_PLAY_MEDIA_SCRIPT = "play_media"
 CONF_UNJOIN_SCRIPT = "unjoin"
+CONF_SELECT_SOURCE_SCRIPT = "select_source"
+CONF_SELECT_SOUND_MODE_SCRIPT = "select_sound_mode"
 CONF_PICTURE = "picture"
 CONF_ATTRIBUTES = "attributes"
 CONF_UNIQUE_ID = "unique_id"
 CONF_VARIABLES = "variables"
 CONF_ICON = "icon"
 CONF_NAME = "name"
+CONF_AVAILABILITY = "availability"
+
+SERVICE_GET_STATISTICS = "get_statistics"
+SERVICE_SEND_COMMAND = "send_command"
+
+ATTR_COMMAND = "command"
+ATTR_DATA = "data"
+ATTR_MAX_CONCURRENCY = "max_concurrency"
+ATTR_TIMEOUT = "timeout"
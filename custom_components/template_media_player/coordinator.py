@@ -0,0 +1,227 @@
+"""Shared tracking for the players of the Template Media Player platform."""
+
+from collections.abc import Callable
+import logging
+from typing import Any
+
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
+)
+from homeassistant.exceptions import TemplateError
+from homeassistant.helpers.event import (
+    TrackTemplate,
+    TrackTemplateResult,
+    TrackTemplateResultInfo,
+    async_track_state_change_event,
+    async_track_template_result,
+)
+from homeassistant.helpers.template import Template
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+from .templates import GlobalTemplate
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_COORDINATOR: HassKey["TrackingCoordinator"] = HassKey(DOMAIN)
+
+type StateChangeAction = Callable[[Event[EventStateChangedData]], None]
+type GlobalTemplateAction = Callable[[dict[str, Any] | TemplateError], None]
+type TemplateResultAction = Callable[
+    [Event[EventStateChangedData] | None, list[TrackTemplateResult]], None
+]
+
+
+class _SharedGlobalTemplate:
+    """Global template tracked once for all players that use it."""
+
+    def __init__(self) -> None:
+        """Initialize the shared global template."""
+        self.result_info: TrackTemplateResultInfo | None = None
+        self.result: dict[str, Any] | TemplateError | None = None
+        self.actions: list[GlobalTemplateAction] = []
+
+    @callback
+    def async_rendered(
+        self,
+        event: Event[EventStateChangedData] | None,
+        updates: list[TrackTemplateResult],
+    ) -> None:
+        """Pass the variables of the global template to all players."""
+        self.result = result = updates[-1].result
+
+        if isinstance(result, TemplateError):
+            _LOGGER.error("Could not render global template: %s", result)
+
+        for action in list(self.actions):
+            action(result)
+
+
+class _SharedTemplate:
+    """Template tracked once for all players that use it."""
+
+    def __init__(self) -> None:
+        """Initialize the shared template."""
+        self.result_info: TrackTemplateResultInfo | None = None
+        self.updates: list[TrackTemplateResult] | None = None
+        self.actions: list[TemplateResultAction] = []
+
+    @callback
+    def async_rendered(
+        self,
+        event: Event[EventStateChangedData] | None,
+        updates: list[TrackTemplateResult],
+    ) -> None:
+        """Pass the result of the template to all players."""
+        self.updates = updates
+
+        for action in list(self.actions):
+            action(event, updates)
+
+
+class TrackingCoordinator:
+    """Share state change listeners and templates between players.
+
+    Each referenced entity is subscribed to once and its state changes are fanned
+    out to all dependent players. Global, state and attribute templates that do
+    not depend on the player rendering them are tracked and rendered once per
+    distinct template.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the tracking coordinator."""
+        self.hass = hass
+        self._entity_actions: dict[str, list[StateChangeAction]] = {}
+        self._entity_unsubs: dict[str, CALLBACK_TYPE] = {}
+        self._global_templates: dict[str, _SharedGlobalTemplate] = {}
+        self._templates: dict[str, _SharedTemplate] = {}
+
+    @property
+    def listeners(self) -> int:
+        """Return the number of subscriptions held by the coordinator."""
+        return (
+            len(self._entity_unsubs)
+            + len(self._global_templates)
+            + len(self._templates)
+        )
+
+    @callback
+    def async_track_entities(
+        self, entity_ids: set[str], action: StateChangeAction
+    ) -> CALLBACK_TYPE:
+        """Call an action on state changes of the entities."""
+        for entity_id in entity_ids:
+            actions = self._entity_actions.setdefault(entity_id, [])
+            actions.append(action)
+
+            if entity_id not in self._entity_unsubs:
+                self._entity_unsubs[entity_id] = async_track_state_change_event(
+                    self.hass, entity_id, self._async_entity_state_changed
+                )
+
+        @callback
+        def _async_remove() -> None:
+            for entity_id in entity_ids:
+                actions = self._entity_actions[entity_id]
+                actions.remove(action)
+
+                if not actions:
+                    del self._entity_actions[entity_id]
+                    self._entity_unsubs.pop(entity_id)()
+
+        return _async_remove
+
+    @callback
+    def _async_entity_state_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Fan a state change out to the dependent players."""
+        for action in list(self._entity_actions.get(event.data["entity_id"], ())):
+            action(event)
+
+    @callback
+    def async_track_global_template(
+        self,
+        template: GlobalTemplate,
+        action: GlobalTemplateAction,
+        log_fn: Callable[[int, str], None] | None = None,
+    ) -> CALLBACK_TYPE:
+        """Call an action with the variables of a shared global template."""
+        key = template.template
+
+        if (shared := self._global_templates.get(key)) is None:
+            shared = self._global_templates[key] = _SharedGlobalTemplate()
+            shared.actions.append(action)
+            shared.result_info = async_track_template_result(
+                self.hass,
+                [TrackTemplate(template, None)],
+                shared.async_rendered,
+                log_fn=log_fn,
+            )
+            shared.result_info.async_refresh()
+        else:
+            shared.actions.append(action)
+            if shared.result is not None:
+                action(shared.result)
+
+        @callback
+        def _async_remove() -> None:
+            shared.actions.remove(action)
+
+            if not shared.actions:
+                del self._global_templates[key]
+                if shared.result_info is not None:
+                    shared.result_info.async_remove()
+
+        return _async_remove
+
+    @callback
+    def async_track_template(
+        self,
+        template: Template,
+        action: TemplateResultAction,
+        log_fn: Callable[[int, str], None] | None = None,
+    ) -> CALLBACK_TYPE:
+        """Call an action with the results of a shared template.
+
+        The template is rendered without variables, so it must not read any
+        variable of the players.
+        """
+        key = template.template
+
+        if (shared := self._templates.get(key)) is None:
+            shared = self._templates[key] = _SharedTemplate()
+            shared.actions.append(action)
+            shared.result_info = async_track_template_result(
+                self.hass,
+                [TrackTemplate(template, None)],
+                shared.async_rendered,
+                log_fn=log_fn,
+            )
+            shared.result_info.async_refresh()
+        else:
+            shared.actions.append(action)
+            if shared.updates is not None:
+                action(None, shared.updates)
+
+        @callback
+        def _async_remove() -> None:
+            shared.actions.remove(action)
+
+            if not shared.actions:
+                del self._templates[key]
+                if shared.result_info is not None:
+                    shared.result_info.async_remove()
+
+        return _async_remove
+
+
+@callback
+def async_get_coordinator(hass: HomeAssistant) -> TrackingCoordinator:
+    """Return the tracking coordinator of the platform."""
+    if (coordinator := hass.data.get(DATA_COORDINATOR)) is None:
+        coordinator = hass.data[DATA_COORDINATOR] = TrackingCoordinator(hass)
+
+    return coordinator
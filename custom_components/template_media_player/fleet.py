@@ -0,0 +1,57 @@
+"""Parallel command dispatch for the Template Media Player integration."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Mapping
+import logging
+import time
+from typing import Any
+
+from homeassistant.exceptions import HomeAssistantError
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_dispatch(
+    targets: Mapping[str, Callable[[], Awaitable[Any]]],
+    max_concurrency: int,
+    timeout: float,
+) -> dict[str, Any]:
+    """Call all targets concurrently and return their timings and failures.
+
+    At most `max_concurrency` targets run at the same time and each of them is
+    cancelled once it ran for `timeout` seconds, so the total duration is close to
+    the slowest target instead of the sum of all of them.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _async_call(target: Callable[[], Awaitable[Any]]) -> dict[str, Any]:
+        async with semaphore:
+            start = time.perf_counter()
+            result: dict[str, Any] = {}
+
+            try:
+                async with asyncio.timeout(timeout):
+                    await target()
+            except TimeoutError:
+                result["error"] = f"Timed out after {timeout:g} seconds"
+            except HomeAssistantError as err:
+                result["error"] = str(err) or type(err).__name__
+            except Exception as err:
+                _LOGGER.exception("Unexpected error running command")
+                result["error"] = str(err) or type(err).__name__
+
+            result["duration_ms"] = (time.perf_counter() - start) * 1000
+            return result
+
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(_async_call(target) for target in targets.values())
+    )
+    failed = sum("error" in result for result in results)
+
+    return {
+        "duration_ms": (time.perf_counter() - start) * 1000,
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "players": dict(zip(targets, results, strict=True)),
+    }
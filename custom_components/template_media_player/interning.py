@@ -0,0 +1,114 @@
+"""Sharing of identical configuration between the players of the platform."""
+
+from collections.abc import Iterable, Sequence
+import hashlib
+import json
+from typing import Any
+from weakref import WeakValueDictionary
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.script_variables import ScriptVariables
+from homeassistant.helpers.template import Template
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+from .templates import GlobalTemplate
+
+DATA_INTERNER: HassKey["Interner"] = HassKey(f"{DOMAIN}_interner")
+
+
+def config_key(config: Any) -> str:
+    """Return a hash of a validated configuration."""
+    return hashlib.sha256(
+        json.dumps(config, sort_keys=True, default=_config_value).encode()
+    ).hexdigest()
+
+
+def _config_value(value: Any) -> Any:
+    """Return a value of a configuration that can be serialized."""
+    if isinstance(value, Template):
+        return {"template": value.template}
+
+    if isinstance(value, ScriptVariables):
+        return value.variables
+
+    return str(value)
+
+
+class Interner:
+    """Share identical templates and script sequences between players.
+
+    Players created from the same configuration receive the same template
+    instances, so each template is compiled once and rendered with the variables
+    of the player. Script sequences are shared the same way, so the templates
+    inside them are also only compiled once, while each player keeps its own
+    script and runs.
+
+    Templates are held weakly, so they are dropped once no player uses them.
+    Script sequences are dropped by `prune` when the players are reloaded.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the interner."""
+        self.hass = hass
+        self._templates: WeakValueDictionary[str, Template] = WeakValueDictionary()
+        self._global_templates: WeakValueDictionary[str, GlobalTemplate] = (
+            WeakValueDictionary()
+        )
+        self._sequences: dict[str, Sequence[dict[str, Any]]] = {}
+        self.shared = 0
+
+    def template(self, template: str) -> Template:
+        """Return the template instance for a template string."""
+        if (interned := self._templates.get(template)) is None:
+            interned = self._templates[template] = Template(template, self.hass)
+        else:
+            self.shared += 1
+
+        return interned
+
+    def global_template(self, template: str) -> GlobalTemplate:
+        """Return the global template instance for a template string."""
+        if (interned := self._global_templates.get(template)) is None:
+            interned = self._global_templates[template] = GlobalTemplate(
+                template, self.hass
+            )
+        else:
+            self.shared += 1
+
+        return interned
+
+    def sequence(self, sequence: Sequence[dict[str, Any]]) -> Sequence[dict[str, Any]]:
+        """Return the shared instance of a validated script sequence."""
+        key = config_key(sequence)
+
+        if (interned := self._sequences.get(key)) is None:
+            interned = self._sequences[key] = sequence
+        else:
+            self.shared += 1
+
+        return interned
+
+    def prune(self, sequences: Iterable[Sequence[dict[str, Any]]]) -> None:
+        """Drop the script sequences that are not among the given ones."""
+        used = {config_key(sequence) for sequence in sequences}
+
+        for key in self._sequences.keys() - used:
+            del self._sequences[key]
+
+    def as_dict(self) -> dict[str, int]:
+        """Return the number of interned and shared objects."""
+        return {
+            "templates": len(self._templates) + len(self._global_templates),
+            "sequences": len(self._sequences),
+            "shared": self.shared,
+        }
+
+
+@callback
+def async_get_interner(hass: HomeAssistant) -> Interner:
+    """Return the interner of the platform."""
+    if (interner := hass.data.get(DATA_INTERNER)) is None:
+        interner = hass.data[DATA_INTERNER] = Interner(hass)
+
+    return interner
@@ -1,11 +1,16 @@
 """Template Media Player Component for Home Assistant."""
 
-from collections.abc import Callable, Sequence
+import asyncio
+from collections.abc import Awaitable, Callable, Iterator, Mapping, Sequence
+from datetime import timedelta
+from functools import cache, partial
 import logging
-from typing import Any, cast
+import time
+from typing import Any, NamedTuple, cast
 
 import voluptuous as vol
 
+from homeassistant import config as conf_util
 from homeassistant.components.media_player import (
     DOMAIN as MEDIA_PLAYER_DOMAIN,
     PLATFORM_SCHEMA as MEDIA_PLAYER_PLATFORM_SCHEMA,
@@ -20,28 +25,107 @@ from homeassistant.components.media_player import (
     SearchMediaQuery,
     async_process_play_media_url,
 )
+from homeassistant.components.media_player.const import (
+    ATTR_ENTITY_PICTURE_LOCAL,
+    ATTR_INPUT_SOURCE_LIST,
+    ATTR_MEDIA_CONTENT_ID,
+    ATTR_MEDIA_DURATION,
+    ATTR_MEDIA_EXTRA,
+    ATTR_MEDIA_POSITION,
+    ATTR_MEDIA_POSITION_UPDATED_AT,
+    ATTR_MEDIA_TITLE,
+    ATTR_SOUND_MODE_LIST,
+    CONTENT_AUTH_EXPIRY_TIME,
+    MediaClass,
+)
 from homeassistant.components.media_source import (
     async_resolve_media,
     is_media_source_id,
 )
 from homeassistant.components.template.template_entity import TemplateEntity
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.exceptions import HomeAssistantError, TemplateError
+from homeassistant.const import (
+    ATTR_DEVICE_CLASS,
+    ATTR_ENTITY_PICTURE,
+    ATTR_FRIENDLY_NAME,
+    ATTR_ICON,
+    ATTR_RESTORED,
+    ATTR_SUPPORTED_FEATURES,
+    SERVICE_RELOAD,
+    STATE_UNAVAILABLE,
+)
+from homeassistant.core import (
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    State,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import (
+    HomeAssistantError,
+    ServiceValidationError,
+    TemplateError,
+)
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity_component import EntityComponent
-from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.script import Script, Template
+from homeassistant.helpers.entity_platform import (
+    AddEntitiesCallback,
+    EntityPlatform,
+    async_get_current_platform,
+)
+from homeassistant.helpers.entity_registry import EventEntityRegistryUpdatedData
+from homeassistant.helpers.event import (
+    TrackTemplate,
+    TrackTemplateResult,
+    TrackTemplateResultInfo,
+    async_track_entity_registry_updated_event,
+    async_track_template_result,
+)
+from homeassistant.helpers.script import (
+    DEFAULT_MAX,
+    DEFAULT_SCRIPT_MODE,
+    SCRIPT_MODE_CHOICES,
+    SCRIPT_MODE_RESTART,
+    Script,
+)
+from homeassistant.helpers.script_variables import ScriptVariables
+from homeassistant.helpers.service import (
+    async_extract_entity_ids,
+    async_register_admin_service,
+)
+from homeassistant.helpers.template import Template, TemplateStateFromEntityId
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
+from homeassistant.loader import async_get_integration
+from homeassistant.util.hass_dict import HassKey
+from homeassistant.util.json import JsonValueType
 
+from .cache import SingleFlight, TTLCache
+from .coalescer import CoalescerMerge, CommandCoalescer, merge_latest, merge_steps
 from .const import (
+    ATTR_COMMAND,
+    ATTR_DATA,
+    ATTR_MAX_CONCURRENCY,
+    ATTR_TIMEOUT,
+    CONF_ATTRIBUTE_RATE_LIMITS,
     CONF_ATTRIBUTES,
+    CONF_AVAILABILITY,
+    CONF_BACKGROUND,
     CONF_BASE_MEDIA_PLAYER_ENTITY_ID,
+    CONF_BATCH_ATTRIBUTES,
+    CONF_BROWSE_CACHE,
     CONF_BROWSE_MEDIA_ENTITY_ID,
     CONF_CLEAR_PLAYLIST_SCRIPT,
+    CONF_COALESCE,
+    CONF_COMPUTED_VARIABLES,
     CONF_DEVICE_CLASS,
+    CONF_ENTITY_IDS,
     CONF_GLOBAL_TEMPLATE,
     CONF_ICON,
     CONF_JOIN_SCRIPT,
+    CONF_MAX,
+    CONF_MAX_SIZE,
     CONF_MEDIA_NEXT_TRACK_SCRIPT,
     CONF_MEDIA_PAUSE_SCRIPT,
     CONF_MEDIA_PLAY_PAUSE_SCRIPT,
@@ -50,58 +134,413 @@ from .const import (
     CONF_MEDIA_PREVIOUS_TRACK_SCRIPT,
     CONF_MEDIA_SEEK_SCRIPT,
     CONF_MEDIA_STOP_SCRIPT,
+    CONF_MODE,
     CONF_NAME,
+    CONF_NATIVE_POSITION,
+    CONF_OPTIMISTIC,
+    CONF_OPTIMISTIC_TIMEOUT,
+    CONF_PASSTHROUGH_ATTRIBUTES,
     CONF_PICTURE,
     CONF_PLAY_MEDIA_SCRIPT,
+    CONF_PRE_RESOLVE,
+    CONF_RATE_LIMIT,
     CONF_REPEAT_SET_SCRIPT,
+    CONF_RESOLVE_CACHE,
+    CONF_SEARCH_CACHE,
     CONF_SEARCH_MEDIA_ENTITY_ID,
+    CONF_SELECT_SOUND_MODE_SCRIPT,
+    CONF_SELECT_SOURCE_SCRIPT,
+    CONF_SERVICE_OPTIONS,
     CONF_SERVICE_SCRIPTS,
     CONF_SHUFFLE_SET_SCRIPT,
     CONF_SOUND_MODE_SCRIPTS,
     CONF_SOURCE_SCRIPTS,
     CONF_STATE,
+    CONF_STATISTICS,
+    CONF_SUSPEND_STATES,
     CONF_TOGGLE_SCRIPT,
+    CONF_TTL,
     CONF_TURN_OFF_SCRIPT,
     CONF_TURN_ON_SCRIPT,
     CONF_UNIQUE_ID,
     CONF_UNJOIN_SCRIPT,
+    CONF_UNRECORDED_ATTRIBUTES,
     CONF_VARIABLES,
     CONF_VOLUME_DOWN_SCRIPT,
     CONF_VOLUME_MUTE_SCRIPT,
     CONF_VOLUME_SET_SCRIPT,
     CONF_VOLUME_UP_SCRIPT,
+    CONF_WARM_UP_SCRIPTS,
+    DOMAIN,
+    SERVICE_GET_STATISTICS,
+    SERVICE_SEND_COMMAND,
+)
+from .coordinator import async_get_coordinator
+from .fleet import async_dispatch
+from .interning import async_get_interner, config_key
+from .optimistic import OptimisticState, expected_changes
+from .performance import PlayerStatistics
+from .position import MediaPosition
+from .scripts import LazyScripts
+from .templates import (
+    ComputedVariablesGroup,
+    GlobalTemplate,
+    TemplateGroup,
+    ThrottledTemplate,
+    TimedTemplate,
+    template_dependencies,
+    template_exports,
+    template_variables,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
-MEDIA_PLAYER_SCHEMA = vol.Schema(
+DEFAULT_UNRECORDED_ATTRIBUTES = [
+    ATTR_ENTITY_PICTURE_LOCAL,
+    ATTR_MEDIA_EXTRA,
+    ATTR_MEDIA_POSITION,
+    ATTR_MEDIA_POSITION_UPDATED_AT,
+    "media_image_hash",
+    "media_image_url",
+    "media_summary",
+]
+
+COALESCE_MERGES: dict[str, CoalescerMerge] = {
+    CONF_MEDIA_SEEK_SCRIPT: merge_latest,
+    CONF_VOLUME_SET_SCRIPT: merge_latest,
+    CONF_VOLUME_UP_SCRIPT: merge_steps,
+    CONF_VOLUME_DOWN_SCRIPT: merge_steps,
+}
+
+DEFAULT_SCRIPT_MODES: dict[str, str] = {
+    CONF_MEDIA_SEEK_SCRIPT: SCRIPT_MODE_RESTART,
+    CONF_VOLUME_SET_SCRIPT: SCRIPT_MODE_RESTART,
+}
+
+ATTRIBUTE_VARIABLES = frozenset({"attribute"})
+
+SUSPEND_STATES = (
+    MediaPlayerState.OFF,
+    MediaPlayerState.ON,
+    MediaPlayerState.IDLE,
+    MediaPlayerState.PLAYING,
+    MediaPlayerState.PAUSED,
+    MediaPlayerState.BUFFERING,
+    STATE_UNAVAILABLE,
+)
+
+
+def _validate_service_options(
+    service_options: dict[str, ConfigType],
+) -> dict[str, ConfigType]:
+    """Validate that the options are supported by their services."""
+    for service, options in service_options.items():
+        if CONF_COALESCE in options and service not in COALESCE_MERGES:
+            raise vol.Invalid(f"Service {service} does not support coalescing")
+
+    return service_options
+
+
+SERVICE_OPTIONS_SCHEMA = vol.Schema(
     {
-        vol.Optional(CONF_NAME): cv.template,
-        vol.Optional(CONF_UNIQUE_ID): cv.string,
-        vol.Optional(CONF_ICON): cv.template,
-        vol.Optional(CONF_PICTURE): cv.template,
-        vol.Optional(CONF_VARIABLES): cv.SCRIPT_VARIABLES_SCHEMA,
-        vol.Optional(CONF_ATTRIBUTES): vol.Schema({cv.string: cv.template}),
-        vol.Optional(CONF_DEVICE_CLASS): cv.string,
-        vol.Optional(CONF_GLOBAL_TEMPLATE): cv.template,
-        vol.Optional(CONF_STATE): cv.template,
-        vol.Optional(CONF_BASE_MEDIA_PLAYER_ENTITY_ID): cv.entity_id,
-        vol.Optional(CONF_BROWSE_MEDIA_ENTITY_ID): cv.entity_id,
-        vol.Optional(CONF_SEARCH_MEDIA_ENTITY_ID): cv.entity_id,
-        vol.Optional(CONF_ATTRIBUTES, default={}): {cv.string: cv.template},
-        vol.Optional(CONF_SERVICE_SCRIPTS, default={}): {cv.string: cv.SCRIPT_SCHEMA},
-        vol.Optional(CONF_SOUND_MODE_SCRIPTS, default={}): {
-            cv.string: cv.SCRIPT_SCHEMA
-        },
-        vol.Optional(CONF_SOURCE_SCRIPTS, default={}): {cv.string: cv.SCRIPT_SCHEMA},
+        vol.Optional(CONF_COALESCE): cv.positive_time_period,
+        vol.Optional(CONF_MODE): vol.In(SCRIPT_MODE_CHOICES),
+        vol.Optional(CONF_MAX): vol.All(vol.Coerce(int), vol.Range(min=2)),
+        vol.Optional(CONF_BACKGROUND): cv.boolean,
     }
 )
 
+
+def _cache_schema(ttl: timedelta, max_size: int) -> vol.Schema:
+    """Return the schema of a cache with the given defaults."""
+    return vol.Schema(
+        {
+            vol.Optional(CONF_TTL, default=ttl): cv.positive_time_period,
+            vol.Optional(CONF_MAX_SIZE, default=max_size): cv.positive_int,
+        }
+    )
+
+
+RESOLVE_CACHE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_TTL, default=timedelta(hours=1)): vol.All(
+            cv.positive_time_period,
+            vol.Range(
+                max=timedelta(seconds=CONTENT_AUTH_EXPIRY_TIME),
+                max_included=False,
+                msg="ttl must be shorter than the expiry of signed media URLs",
+            ),
+        ),
+        vol.Optional(CONF_MAX_SIZE, default=256): cv.positive_int,
+        vol.Optional(CONF_PRE_RESOLVE, default=10): cv.positive_int,
+    }
+)
+
+
+def _player_templates(config: ConfigType) -> dict[str, str]:
+    """Return the tracked templates of a player prefixed with its global template."""
+    templates: dict[str, str] = {}
+    prefix = ""
+
+    if global_template := config.get(CONF_GLOBAL_TEMPLATE):
+        templates[CONF_GLOBAL_TEMPLATE] = global_template.template
+        prefix = global_template.template + "\n"
+
+    for key in (CONF_NAME, CONF_STATE, CONF_AVAILABILITY, CONF_ICON, CONF_PICTURE):
+        if template := config.get(key):
+            templates[key] = prefix + template.template
+
+    for name, template in config.get(CONF_COMPUTED_VARIABLES, {}).items():
+        templates[f"{CONF_COMPUTED_VARIABLES}.{name}"] = prefix + template.template
+
+    for attribute, template in config.get(CONF_ATTRIBUTES, {}).items():
+        templates[f"{CONF_ATTRIBUTES}.{attribute}"] = prefix + template.template
+
+    return templates
+
+
+def _script_sequences(config: ConfigType) -> Iterator[Sequence[dict[str, Any]]]:
+    """Return the sequences of the scripts of a player."""
+    for key in (CONF_SERVICE_SCRIPTS, CONF_SOURCE_SCRIPTS, CONF_SOUND_MODE_SCRIPTS):
+        yield from config[key].values()
+
+
+def _analyse_templates(config: ConfigType) -> ConfigType:
+    """Log the states read by the templates and warn about iterating states."""
+    for key, template in _player_templates(config).items():
+        if (dependencies := template_dependencies(template)) is None:
+            continue
+
+        _LOGGER.debug(
+            "Template %s reads entities %s and domains %s: %s",
+            key,
+            sorted(dependencies.entities),
+            sorted(dependencies.domains),
+            template,
+        )
+
+        if dependencies.all_states and CONF_ENTITY_IDS not in config:
+            _LOGGER.warning(
+                "Template %s reads all states, so it is rendered on every state "
+                "change at most once per minute. Set the %s option to the entities "
+                "it depends on to only track those: %s",
+                key,
+                CONF_ENTITY_IDS,
+                template,
+            )
+        elif dependencies.iterated_domains and CONF_ENTITY_IDS not in config:
+            _LOGGER.warning(
+                "Template %s reads all states of the domains %s, so it is rendered "
+                "on every state change in them at most once per second. Set the %s "
+                "option to the entities it depends on to only track those: %s",
+                key,
+                sorted(dependencies.iterated_domains),
+                CONF_ENTITY_IDS,
+                template,
+            )
+
+    return config
+
+
+MEDIA_PLAYER_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional(CONF_NAME): cv.template,
+            vol.Optional(CONF_UNIQUE_ID): cv.string,
+            vol.Optional(CONF_ICON): cv.template,
+            vol.Optional(CONF_PICTURE): cv.template,
+            vol.Optional(CONF_VARIABLES): cv.SCRIPT_VARIABLES_SCHEMA,
+            vol.Optional(CONF_DEVICE_CLASS): cv.string,
+            vol.Optional(CONF_GLOBAL_TEMPLATE): cv.template,
+            vol.Optional(CONF_COMPUTED_VARIABLES, default={}): {cv.string: cv.template},
+            vol.Optional(CONF_STATE): cv.template,
+            vol.Optional(CONF_AVAILABILITY): cv.template,
+            vol.Optional(CONF_BASE_MEDIA_PLAYER_ENTITY_ID): cv.entity_id,
+            vol.Optional(CONF_BROWSE_MEDIA_ENTITY_ID): cv.entity_id,
+            vol.Optional(CONF_SEARCH_MEDIA_ENTITY_ID): cv.entity_id,
+            vol.Optional(CONF_ATTRIBUTES, default={}): {cv.string: cv.template},
+            vol.Optional(CONF_BATCH_ATTRIBUTES, default=False): cv.boolean,
+            vol.Optional(CONF_RATE_LIMIT): cv.positive_time_period,
+            vol.Optional(CONF_NATIVE_POSITION, default=False): cv.boolean,
+            vol.Optional(CONF_OPTIMISTIC, default=False): cv.boolean,
+            vol.Optional(
+                CONF_OPTIMISTIC_TIMEOUT, default=timedelta(seconds=10)
+            ): cv.positive_time_period,
+            vol.Optional(CONF_PASSTHROUGH_ATTRIBUTES, default=False): cv.boolean,
+            vol.Optional(
+                CONF_UNRECORDED_ATTRIBUTES, default=DEFAULT_UNRECORDED_ATTRIBUTES
+            ): vol.All(cv.ensure_list, [cv.string]),
+            vol.Optional(CONF_SUSPEND_STATES, default=[]): vol.All(
+                cv.ensure_list, [vol.In(SUSPEND_STATES)]
+            ),
+            vol.Optional(CONF_ATTRIBUTE_RATE_LIMITS, default={}): {
+                cv.string: cv.positive_time_period
+            },
+            vol.Optional(CONF_WARM_UP_SCRIPTS, default=False): cv.boolean,
+            vol.Optional(CONF_STATISTICS, default=False): cv.boolean,
+            vol.Optional(CONF_SERVICE_SCRIPTS, default={}): {
+                cv.string: cv.SCRIPT_SCHEMA
+            },
+            vol.Optional(CONF_SOUND_MODE_SCRIPTS, default={}): {
+                cv.string: cv.SCRIPT_SCHEMA
+            },
+            vol.Optional(CONF_SOURCE_SCRIPTS, default={}): {
+                cv.string: cv.SCRIPT_SCHEMA
+            },
+            vol.Optional(CONF_BROWSE_CACHE): _cache_schema(timedelta(minutes=5), 128),
+            vol.Optional(CONF_SEARCH_CACHE): _cache_schema(timedelta(seconds=30), 32),
+            vol.Optional(CONF_RESOLVE_CACHE): RESOLVE_CACHE_SCHEMA,
+            vol.Optional(CONF_SERVICE_OPTIONS, default={}): vol.All(
+                {cv.string: SERVICE_OPTIONS_SCHEMA}, _validate_service_options
+            ),
+            vol.Optional(CONF_ENTITY_IDS): cv.entity_ids,
+        }
+    ),
+    _analyse_templates,
+)
+
 PLATFORM_SCHEMA = MEDIA_PLAYER_PLATFORM_SCHEMA.extend(
     {vol.Required(CONF_MEDIA_PLAYERS): cv.schema_with_slug_keys(MEDIA_PLAYER_SCHEMA)}
 )
 
 
+class Command(NamedTuple):
+    """Entity method, required features and arguments of a command.
+
+    The entity has to support all flags of at least one of the features.
+    """
+
+    method: str
+    features: tuple[MediaPlayerEntityFeature, ...]
+    schema: dict[vol.Marker, Any]
+
+
+COMMANDS: dict[str, Command] = {
+    CONF_CLEAR_PLAYLIST_SCRIPT: Command(
+        "async_clear_playlist", (MediaPlayerEntityFeature.CLEAR_PLAYLIST,), {}
+    ),
+    CONF_JOIN_SCRIPT: Command(
+        "async_join_players",
+        (MediaPlayerEntityFeature.GROUPING,),
+        {vol.Required("group_members"): cv.entity_ids},
+    ),
+    CONF_MEDIA_NEXT_TRACK_SCRIPT: Command(
+        "async_media_next_track", (MediaPlayerEntityFeature.NEXT_TRACK,), {}
+    ),
+    CONF_MEDIA_PAUSE_SCRIPT: Command(
+        "async_media_pause", (MediaPlayerEntityFeature.PAUSE,), {}
+    ),
+    CONF_MEDIA_PLAY_PAUSE_SCRIPT: Command(
+        "async_media_play_pause",
+        (MediaPlayerEntityFeature.PLAY | MediaPlayerEntityFeature.PAUSE,),
+        {},
+    ),
+    CONF_MEDIA_PLAY_SCRIPT: Command(
+        "async_media_play", (MediaPlayerEntityFeature.PLAY,), {}
+    ),
+    CONF_MEDIA_PREVIOUS_TRACK_SCRIPT: Command(
+        "async_media_previous_track", (MediaPlayerEntityFeature.PREVIOUS_TRACK,), {}
+    ),
+    CONF_MEDIA_SEEK_SCRIPT: Command(
+        "async_media_seek",
+        (MediaPlayerEntityFeature.SEEK,),
+        {vol.Required("position"): cv.positive_float},
+    ),
+    CONF_MEDIA_STOP_SCRIPT: Command(
+        "async_media_stop", (MediaPlayerEntityFeature.STOP,), {}
+    ),
+    CONF_PLAY_MEDIA_SCRIPT: Command(
+        "async_play_media",
+        (MediaPlayerEntityFeature.PLAY_MEDIA,),
+        {vol.Required("media_type"): cv.string, vol.Required("media_id"): cv.string},
+    ),
+    CONF_REPEAT_SET_SCRIPT: Command(
+        "async_set_repeat",
+        (MediaPlayerEntityFeature.REPEAT_SET,),
+        {vol.Required("repeat"): vol.Coerce(RepeatMode)},
+    ),
+    CONF_SELECT_SOUND_MODE_SCRIPT: Command(
+        "async_select_sound_mode",
+        (MediaPlayerEntityFeature.SELECT_SOUND_MODE,),
+        {vol.Required("sound_mode"): cv.string},
+    ),
+    CONF_SELECT_SOURCE_SCRIPT: Command(
+        "async_select_source",
+        (MediaPlayerEntityFeature.SELECT_SOURCE,),
+        {vol.Required("source"): cv.string},
+    ),
+    CONF_SHUFFLE_SET_SCRIPT: Command(
+        "async_set_shuffle",
+        (MediaPlayerEntityFeature.SHUFFLE_SET,),
+        {vol.Required("shuffle"): cv.boolean},
+    ),
+    CONF_TOGGLE_SCRIPT: Command(
+        "async_toggle",
+        (MediaPlayerEntityFeature.TURN_ON | MediaPlayerEntityFeature.TURN_OFF,),
+        {},
+    ),
+    CONF_TURN_OFF_SCRIPT: Command(
+        "async_turn_off", (MediaPlayerEntityFeature.TURN_OFF,), {}
+    ),
+    CONF_TURN_ON_SCRIPT: Command(
+        "async_turn_on", (MediaPlayerEntityFeature.TURN_ON,), {}
+    ),
+    CONF_UNJOIN_SCRIPT: Command(
+        "async_unjoin_player", (MediaPlayerEntityFeature.GROUPING,), {}
+    ),
+    CONF_VOLUME_DOWN_SCRIPT: Command(
+        "async_volume_down",
+        (MediaPlayerEntityFeature.VOLUME_SET, MediaPlayerEntityFeature.VOLUME_STEP),
+        {},
+    ),
+    CONF_VOLUME_MUTE_SCRIPT: Command(
+        "async_mute_volume",
+        (MediaPlayerEntityFeature.VOLUME_MUTE,),
+        {vol.Required("mute"): cv.boolean},
+    ),
+    CONF_VOLUME_SET_SCRIPT: Command(
+        "async_set_volume_level",
+        (MediaPlayerEntityFeature.VOLUME_SET,),
+        {vol.Required("volume"): cv.small_float},
+    ),
+    CONF_VOLUME_UP_SCRIPT: Command(
+        "async_volume_up",
+        (MediaPlayerEntityFeature.VOLUME_SET, MediaPlayerEntityFeature.VOLUME_STEP),
+        {},
+    ),
+}
+
+
+def _validate_command_data(data: dict[str, Any]) -> dict[str, Any]:
+    """Validate the data of a command against the arguments it takes."""
+    schema = COMMANDS[data[ATTR_COMMAND]].schema
+
+    try:
+        data[ATTR_DATA] = vol.Schema(schema)(data[ATTR_DATA])
+    except vol.Invalid as err:
+        raise vol.Invalid(
+            f"Invalid data for command {data[ATTR_COMMAND]}: {err}", [ATTR_DATA]
+        ) from err
+
+    return data
+
+
+SEND_COMMAND_SCHEMA = vol.All(
+    cv.make_entity_service_schema(
+        {
+            vol.Required(ATTR_COMMAND): vol.In(COMMANDS),
+            vol.Optional(ATTR_DATA, default={}): dict,
+            vol.Optional(ATTR_MAX_CONCURRENCY, default=10): cv.positive_int,
+            vol.Optional(ATTR_TIMEOUT, default=timedelta(seconds=10)): vol.All(
+                cv.positive_time_period,
+                vol.Range(min=timedelta(0), min_included=False),
+            ),
+        }
+    ),
+    _validate_command_data,
+)
+
+
 async def async_setup_platform(
     hass: HomeAssistant,
     config: ConfigType,
@@ -111,13 +550,240 @@ async def async_setup_platform(
     """Set up the template media players."""
     media_player_configs: dict[str, ConfigType] = config[CONF_MEDIA_PLAYERS]
     media_players: list[TemplateMediaPlayer] = []
+    platform = async_get_current_platform()
+    loaded_players = hass.data.setdefault(DATA_LOADED_PLAYERS, {})
 
     for media_player_name, media_player_config in media_player_configs.items():
-        media_players.append(
-            TemplateMediaPlayer(hass, media_player_config, media_player_name)
+        media_player = _create_media_player(
+            hass, media_player_config, media_player_name
+        )
+        media_players.append(media_player)
+        loaded_players[media_player_name] = LoadedPlayer(
+            config_key(media_player_config), media_player, platform
         )
 
     async_add_entities(media_players)
+    _LOGGER.debug(
+        "Set up %d template media players, sharing %s",
+        len(media_players),
+        async_get_interner(hass).as_dict(),
+    )
+
+    platform.async_register_entity_service(
+        SERVICE_GET_STATISTICS,
+        None,
+        "async_get_statistics",
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    if not hass.services.has_service(DOMAIN, SERVICE_SEND_COMMAND):
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_SEND_COMMAND,
+            _async_send_command,
+            SEND_COMMAND_SCHEMA,
+            SupportsResponse.OPTIONAL,
+        )
+
+    if not hass.services.has_service(DOMAIN, SERVICE_RELOAD):
+        async_register_admin_service(
+            hass,
+            DOMAIN,
+            SERVICE_RELOAD,
+            _async_reload,
+            supports_response=SupportsResponse.OPTIONAL,
+        )
+
+
+class LoadedPlayer(NamedTuple):
+    """Template media player together with the hash of its configuration."""
+
+    config_hash: str
+    media_player: "TemplateMediaPlayer"
+    platform: EntityPlatform
+
+
+DATA_LOADED_PLAYERS: HassKey[dict[str, LoadedPlayer]] = HassKey(
+    f"{DOMAIN}_loaded_players"
+)
+
+
+async def _async_reload(call: ServiceCall) -> ServiceResponse:
+    """Reload the template media players whose configuration changed.
+
+    Each media player is identified by its key under `media_players` and only
+    rebuilt if the hash of its configuration changed, all other media players
+    keep their trackers and scripts.
+    """
+    hass = call.hass
+    start = time.perf_counter()
+    integration = await async_get_integration(hass, MEDIA_PLAYER_DOMAIN)
+    config = await conf_util.async_process_component_and_handle_errors(
+        hass,
+        await conf_util.async_hass_config_yaml(hass),
+        integration,
+        raise_on_failure=True,
+    )
+    if config is None:
+        return None
+
+    media_player_configs: dict[str, tuple[ConfigType, EntityPlatform | None]] = {}
+    loaded_players = hass.data.setdefault(DATA_LOADED_PLAYERS, {})
+    default_platform = next(
+        (loaded.platform for loaded in loaded_players.values()), None
+    )
+
+    for platform_type, platform_config in conf_util.config_per_platform(
+        config, MEDIA_PLAYER_DOMAIN
+    ):
+        if platform_type != DOMAIN:
+            continue
+
+        for name, media_player_config in platform_config[CONF_MEDIA_PLAYERS].items():
+            media_player_configs[name] = (media_player_config, default_platform)
+
+    removed = [name for name in loaded_players if name not in media_player_configs]
+    reloaded: list[str] = []
+    added: list[str] = []
+
+    for name, (media_player_config, _) in media_player_configs.items():
+        if (loaded := loaded_players.get(name)) is None:
+            added.append(name)
+        elif loaded.config_hash != config_key(media_player_config):
+            reloaded.append(name)
+            media_player_configs[name] = (media_player_config, loaded.platform)
+
+    await asyncio.gather(
+        *(
+            loaded_players.pop(name).media_player.async_remove()
+            for name in (*removed, *reloaded)
+        )
+    )
+
+    new_media_players: dict[EntityPlatform, list[TemplateMediaPlayer]] = {}
+
+    for name in (*reloaded, *added):
+        media_player_config, platform = media_player_configs[name]
+
+        if platform is None:
+            _LOGGER.error(
+                "Could not add template media player %s, set up the platform first",
+                name,
+            )
+            continue
+
+        media_player = _create_media_player(hass, media_player_config, name)
+        new_media_players.setdefault(platform, []).append(media_player)
+        loaded_players[name] = LoadedPlayer(
+            config_key(media_player_config), media_player, platform
+        )
+
+    await asyncio.gather(
+        *(
+            platform.async_add_entities(media_players)
+            for platform, media_players in new_media_players.items()
+        )
+    )
+
+    async_get_interner(hass).prune(
+        sequence
+        for media_player_config, _ in media_player_configs.values()
+        for sequence in _script_sequences(media_player_config)
+    )
+
+    duration = (time.perf_counter() - start) * 1000
+    _LOGGER.info(
+        "Reloaded template media players in %.1f ms: %d added, %d reloaded, "
+        "%d removed, %d unchanged",
+        duration,
+        len(added),
+        len(reloaded),
+        len(removed),
+        len(media_player_configs) - len(added) - len(reloaded),
+    )
+    hass.bus.async_fire(f"event_{DOMAIN}_reloaded", context=call.context)
+
+    if not call.return_response:
+        return None
+
+    return {
+        "duration_ms": duration,
+        "added": cast(list[JsonValueType], added),
+        "reloaded": cast(list[JsonValueType], reloaded),
+        "removed": cast(list[JsonValueType], removed),
+        "unchanged": len(media_player_configs) - len(added) - len(reloaded),
+    }
+
+
+async def _async_run_command(entity: "TemplateMediaPlayer", call: ServiceCall) -> None:
+    """Run the command of a send command call on a template media player."""
+    command = call.data[ATTR_COMMAND]
+    method, features, _ = COMMANDS[command]
+
+    if not any(entity.supported_features & feature == feature for feature in features):
+        raise HomeAssistantError(f"{entity.entity_id} does not support {command}")
+
+    entity.async_set_context(call.context)
+    await getattr(entity, method)(**call.data[ATTR_DATA])
+
+
+async def _async_send_command(call: ServiceCall) -> ServiceResponse:
+    """Send a command to all targeted template media players concurrently."""
+    component: EntityComponent[MediaPlayerEntity] = call.hass.data[MEDIA_PLAYER_DOMAIN]
+    targets: dict[str, Callable[[], Awaitable[Any]]] = {}
+
+    for entity_id in sorted(await async_extract_entity_ids(call.hass, call)):
+        if isinstance(entity := component.get_entity(entity_id), TemplateMediaPlayer):
+            targets[entity_id] = partial(_async_run_command, entity, call)
+
+    if not targets:
+        raise ServiceValidationError(
+            f"No template media players targeted by {SERVICE_SEND_COMMAND}"
+        )
+
+    result = await async_dispatch(
+        targets,
+        call.data[ATTR_MAX_CONCURRENCY],
+        call.data[ATTR_TIMEOUT].total_seconds(),
+    )
+
+    return result if call.return_response else None
+
+
+POSITION_ATTRIBUTES = (
+    ATTR_MEDIA_POSITION,
+    ATTR_MEDIA_POSITION_UPDATED_AT,
+    ATTR_MEDIA_DURATION,
+)
+
+PASSTHROUGH_EXCLUDED_ATTRIBUTES = frozenset(
+    {
+        ATTR_DEVICE_CLASS,
+        ATTR_ENTITY_PICTURE,
+        ATTR_FRIENDLY_NAME,
+        ATTR_ICON,
+        ATTR_INPUT_SOURCE_LIST,
+        ATTR_SOUND_MODE_LIST,
+        ATTR_SUPPORTED_FEATURES,
+    }
+)
+
+type SearchMediaKey = tuple[
+    str, MediaType | str | None, str | None, tuple[MediaClass, ...] | None
+]
+
+
+def _browse_state(state: State | None) -> tuple[str | None, Any]:
+    """Return the value and sources of a state the browse results depend on."""
+    if state is None:
+        return None, None
+
+    return state.state, state.attributes.get(ATTR_INPUT_SOURCE_LIST)
+
+
+def _is_placeholder(state: State | None) -> bool:
+    """Return whether a state is missing or kept for a removed entity."""
+    return state is None or bool(state.attributes.get(ATTR_RESTORED))
 
 
 class TemplateMediaPlayer(TemplateEntity, MediaPlayerEntity):
@@ -145,83 +811,714 @@ class TemplateMediaPlayer(TemplateEntity, MediaPlayerEntity):
         self._browse_media_entity_id: str | None = config.get(
             CONF_BROWSE_MEDIA_ENTITY_ID
         )
-        self._global_template: Template | None = config.get(CONF_GLOBAL_TEMPLATE)
+        self._browse_cache: (
+            TTLCache[tuple[str | None, str | None], BrowseMedia] | None
+        ) = None
+        if browse_cache := config.get(CONF_BROWSE_CACHE):
+            self._browse_cache = TTLCache(
+                browse_cache[CONF_MAX_SIZE], browse_cache[CONF_TTL]
+            )
+        self._search_cache: TTLCache[SearchMediaKey, SearchMedia] | None = None
+        if search_cache := config.get(CONF_SEARCH_CACHE):
+            self._search_cache = TTLCache(
+                search_cache[CONF_MAX_SIZE], search_cache[CONF_TTL]
+            )
+        self._search_flight: SingleFlight[SearchMediaKey, SearchMedia] = SingleFlight(
+            hass, f"{name} search"
+        )
+        self._resolve_cache: TTLCache[tuple[str, str], str] | None = None
+        self._pre_resolve = 0
+        if resolve_cache := config.get(CONF_RESOLVE_CACHE):
+            self._resolve_cache = TTLCache(
+                resolve_cache[CONF_MAX_SIZE], resolve_cache[CONF_TTL]
+            )
+            self._pre_resolve = resolve_cache[CONF_PRE_RESOLVE]
+        self._statistics: PlayerStatistics | None = None
+        if config.get(CONF_STATISTICS):
+            self._statistics = PlayerStatistics()
+        self._config = config
+        self._entity_ids: frozenset[str] | None = None
+        if (entity_ids := config.get(CONF_ENTITY_IDS)) is not None:
+            self._entity_ids = frozenset(entity_ids)
+        self._interner = async_get_interner(hass)
+        self._global_template: GlobalTemplate | None = None
+        self._global_template_prefix = ""
+        global_template = config.get(CONF_GLOBAL_TEMPLATE)
+        if global_template and (
+            template_variables(global_template.template) & ATTRIBUTE_VARIABLES
+        ):
+            self._global_template_prefix = global_template.template
+        elif global_template and (
+            self._statistics is None and self._entity_ids is None
+        ):
+            self._global_template = self._interner.global_template(
+                global_template.template
+            )
+        elif global_template:
+            self._global_template = GlobalTemplate(
+                global_template.template,
+                hass,
+                self._statistics.renders[CONF_GLOBAL_TEMPLATE]
+                if self._statistics is not None
+                else None,
+                self._entity_ids,
+            )
+        self._share_global_template = bool(
+            self._global_template is not None
+            and self._statistics is None
+            and self._entity_ids is None
+            and not template_variables(self._global_template.template)
+            & {"this", *self._script_variable_names(config)}
+        )
+        self._computed_variables_template: ComputedVariablesGroup | None = None
+        if computed_variables := config.get(CONF_COMPUTED_VARIABLES):
+            self._computed_variables_template = ComputedVariablesGroup(
+                {
+                    name: TimedTemplate(
+                        self._global_template_prefix + template.template,
+                        hass,
+                        self._statistics.renders[f"{CONF_COMPUTED_VARIABLES}.{name}"],
+                    )
+                    if self._statistics is not None
+                    else self._interner.template(
+                        self._global_template_prefix + template.template
+                    )
+                    for name, template in computed_variables.items()
+                },
+                hass,
+                self._entity_ids,
+            )
         self._state_template: Template | None = config.get(CONF_STATE)
-        self._attribute_templates: dict[str, Template] = config.get(CONF_ATTRIBUTES)
-
-        self._service_scripts = {
-            service: Script(hass, service_script, name, MEDIA_PLAYER_DOMAIN)
-            for service, service_script in cast(
-                dict[str, Sequence[dict[str, Any]]], config.get(CONF_SERVICE_SCRIPTS)
-            ).items()
-        }
-        self._source_scripts = {
-            source: Script(hass, source_script, name, MEDIA_PLAYER_DOMAIN)
-            for source, source_script in cast(
-                dict[str, Sequence[dict[str, Any]]], config.get(CONF_SOURCE_SCRIPTS)
-            ).items()
+        self._attribute_templates: dict[str, Template] = (
+            config.get(CONF_ATTRIBUTES) or {}
+        )
+        rate_limit: timedelta | None = config.get(CONF_RATE_LIMIT)
+        attribute_rate_limits: dict[str, timedelta] = config.get(
+            CONF_ATTRIBUTE_RATE_LIMITS, {}
+        )
+        self._rate_limits = {
+            attribute: attribute_rate_limit
+            for attribute in self._attribute_templates
+            if (
+                attribute_rate_limit := attribute_rate_limits.get(attribute, rate_limit)
+            )
         }
-        self._sound_mode_scripts = {
-            sound_mode: Script(hass, sound_mode_script, name, MEDIA_PLAYER_DOMAIN)
-            for sound_mode, sound_mode_script in cast(
-                dict[str, Sequence[dict[str, Any]]], config.get(CONF_SOUND_MODE_SCRIPTS)
-            ).items()
+        self._attribute_template_group: TemplateGroup | None = None
+        if config.get(CONF_BATCH_ATTRIBUTES) and (
+            batched_templates := {
+                attribute: self._create_template(
+                    attribute, self._global_template_prefix + template.template
+                )
+                for attribute, template in self._attribute_templates.items()
+                if attribute not in self._rate_limits
+            }
+        ):
+            self._attribute_template_group = TemplateGroup(
+                batched_templates, hass, self._entity_ids
+            )
+        self._throttled_result_infos: list[TrackTemplateResultInfo] = []
+        self._suspend_states = frozenset(config.get(CONF_SUSPEND_STATES, ()))
+        self._attribute_track_templates: list[TrackTemplate] = []
+        self._attribute_result_infos: list[TrackTemplateResultInfo] = []
+        self._attributes_suspended = True
+        self._defer_writes = False
+        self._log_fn: Callable[[int, str], None] | None = None
+        self._optimistic: OptimisticState | None = None
+        if config.get(CONF_OPTIMISTIC):
+            self._optimistic = OptimisticState(
+                hass, config[CONF_OPTIMISTIC_TIMEOUT], self.async_write_ha_state
+            )
+        self._media_position: MediaPosition | None = None
+        if config.get(CONF_NATIVE_POSITION):
+            self._media_position = MediaPosition()
+        self._position_attributes: dict[str, Any] = {}
+        self._passthrough = bool(
+            config.get(CONF_PASSTHROUGH_ATTRIBUTES)
+            and self._base_media_player_entity_id
+        )
+        self._passthrough_excluded = PASSTHROUGH_EXCLUDED_ATTRIBUTES.union(
+            self._attribute_templates
+        )
+        if self._media_position is not None:
+            self._passthrough_excluded |= set(POSITION_ATTRIBUTES)
+        self._passthrough_attributes: dict[str, Any] = {}
+
+        service_options: dict[str, ConfigType] = config[CONF_SERVICE_OPTIONS]
+
+        self._service_scripts = LazyScripts(
+            config[CONF_SERVICE_SCRIPTS],
+            partial(self._create_script, hass, name, service_options),
+        )
+        self._source_scripts = LazyScripts(
+            config[CONF_SOURCE_SCRIPTS],
+            lambda _, sequence: self._create_script(
+                hass, name, service_options, CONF_SELECT_SOURCE_SCRIPT, sequence
+            ),
+        )
+        self._sound_mode_scripts = LazyScripts(
+            config[CONF_SOUND_MODE_SCRIPTS],
+            lambda _, sequence: self._create_script(
+                hass, name, service_options, CONF_SELECT_SOUND_MODE_SCRIPT, sequence
+            ),
+        )
+        self._warm_up_scripts: bool = config[CONF_WARM_UP_SCRIPTS]
+        self._background_services = frozenset(
+            service
+            for service, options in service_options.items()
+            if options.get(CONF_BACKGROUND)
+        )
+        self._background_tasks: set[asyncio.Task[None]] = set()
+
+        self._command_coalescers = {
+            service: CommandCoalescer(
+                hass,
+                f"{name} {service}",
+                options[CONF_COALESCE],
+                partial(self._async_execute_service_script, service),
+                COALESCE_MERGES[service],
+            )
+            for service, options in service_options.items()
+            if CONF_COALESCE in options and service in self._service_scripts
         }
 
         self._state: MediaPlayerState | None = None
+        self._script_supported_features = self._get_script_supported_features()
+        self._base_supported_features: MediaPlayerEntityFeature | None = None
+        self._media_player_entities: dict[str, MediaPlayerEntity | None] = {}
+        self._cache_media_player_entities = False
+        self._base_template_variables: dict[str, Any] = {}
+        self._global_variables: dict[str, Any] = {}
+        self._computed_variables: dict[str, Any] = {}
+        self._computed_variables_scope: dict[str, Any] = {}
+        self._computed_variables_result_info: TrackTemplateResultInfo | None = None
+        self._computed_variables_refreshed = False
+        self._template_variables: dict[str, Any] = {}
+
+    def _create_template(self, attribute: str, template: str) -> Template:
+        """Create the template of an attribute, timed, throttled or pinned."""
+        statistics = (
+            self._statistics.renders[attribute.removeprefix("_attr_").lstrip("_")]
+            if self._statistics is not None
+            else None
+        )
 
-        for template in [
-            self._state_template,
-            self._availability_template,
-            self._icon_template,
-            self._friendly_name_template,
-            self._entity_picture_template,
-        ] + (
-            list(self._attribute_templates.values())
-            if self._attribute_templates
-            else []
-        ):
-            if template is None or not isinstance(template, Template):
-                continue
+        if interval := self._rate_limits.get(attribute):
+            return ThrottledTemplate(
+                template, self.hass, interval, statistics, self._entity_ids
+            )
+
+        if statistics is not None or self._entity_ids is not None:
+            return TimedTemplate(template, self.hass, statistics, self._entity_ids)
+
+        return self._interner.template(template)
+
+    @staticmethod
+    def _script_variable_names(config: ConfigType) -> set[str]:
+        """Return the names of the variables defined for the entity."""
+        variables = config.get(CONF_VARIABLES)
+
+        if isinstance(variables, ScriptVariables):
+            return set(variables.variables)
 
-            template.template = self._global_template.template + template.template
+        return set(variables or ())
+
+    @staticmethod
+    def _create_script(
+        hass: HomeAssistant,
+        name: str,
+        service_options: dict[str, ConfigType],
+        service: str,
+        sequence: Sequence[dict[str, Any]],
+    ) -> Script:
+        """Create the script of a service with its configured run mode."""
+        options = service_options.get(service, {})
+
+        return Script(
+            hass,
+            async_get_interner(hass).sequence(sequence),
+            name,
+            MEDIA_PLAYER_DOMAIN,
+            script_mode=options.get(
+                CONF_MODE, DEFAULT_SCRIPT_MODES.get(service, DEFAULT_SCRIPT_MODE)
+            ),
+            max_runs=options.get(CONF_MAX, DEFAULT_MAX),
+        )
 
     async def async_added_to_hass(self) -> None:
         """Register callbacks."""
+        for coalescer in self._command_coalescers.values():
+            self.async_on_remove(coalescer.async_cancel)
+
+        if self._optimistic is not None:
+            self.async_on_remove(self._optimistic.async_cancel)
+
+        self.async_on_remove(self._async_cancel_background_tasks)
+
+        if self._warm_up_scripts:
+            for scripts in (
+                self._service_scripts,
+                self._source_scripts,
+                self._sound_mode_scripts,
+            ):
+                scripts.warm_up()
+
+        if entity_ids := {
+            entity_id
+            for entity_id in (
+                self._base_media_player_entity_id,
+                self._browse_media_entity_id,
+                self._search_media_entity_id,
+            )
+            if entity_id
+        }:
+            self.async_on_remove(
+                async_get_coordinator(self.hass).async_track_entities(
+                    entity_ids, self._async_media_player_state_changed
+                )
+            )
+            self.async_on_remove(
+                async_track_entity_registry_updated_event(
+                    self.hass, entity_ids, self._async_media_player_registry_updated
+                )
+            )
+            self._cache_media_player_entities = True
+            self.async_on_remove(self._async_clear_media_player_entities)
+            self._base_supported_features = self._get_base_supported_features()
+            self._async_update_passthrough_attributes()
+
         self.add_template_attribute(
             "_state", self._state_template, None, self._update_state
         )
         await super().async_added_to_hass()
 
+    @callback
+    def _async_setup_templates(self) -> None:
+        """Set up templates."""
+        super()._async_setup_templates()
+
+        if self._attribute_template_group is not None:
+            self.add_template_attribute(
+                "_attr_extra_state_attributes",
+                self._attribute_template_group,
+                None,
+                self._update_attributes,
+            )
+
+    @callback
+    def _add_attribute_template(
+        self, attribute_key: str, attribute_template: Template
+    ) -> None:
+        """Create a template tracker for the attribute unless it is batched."""
+        if (
+            self._attribute_template_group is not None
+            and attribute_key in self._attribute_template_group.templates
+        ):
+            return
+
+        super()._add_attribute_template(attribute_key, attribute_template)
+
+    @callback
+    def _async_template_startup(
+        self,
+        _hass: HomeAssistant | None,
+        log_fn: Callable[[int, str], None] | None = None,
+    ) -> None:
+        """Set up the template trackers.
+
+        The global template is tracked on its own and the variables it defines are
+        shared with all other templates of the entity through a common variables
+        dictionary, so it is only compiled and rendered once per update. The
+        computed variables are tracked the same way and can use the variables of
+        the global template.
+        """
+        self._base_template_variables = {
+            "this": TemplateStateFromEntityId(self.hass, self.entity_id),
+            **self._render_script_variables(),
+        }
+        self._computed_variables_scope = dict(self._base_template_variables)
+        self._template_variables = dict(self._base_template_variables)
+
+        if self._global_template is not None and self._share_global_template:
+            self.async_on_remove(
+                async_get_coordinator(self.hass).async_track_global_template(
+                    self._global_template, self._async_update_global_variables, log_fn
+                )
+            )
+        elif self._global_template is not None:
+            global_result_info = async_track_template_result(
+                self.hass,
+                [TrackTemplate(self._global_template, self._base_template_variables)],
+                self._handle_global_template_result,
+                log_fn=log_fn,
+            )
+            self.async_on_remove(global_result_info.async_remove)
+            global_result_info.async_refresh()
+
+        if self._computed_variables_template is not None:
+            computed_result_info = async_track_template_result(
+                self.hass,
+                [
+                    TrackTemplate(
+                        self._computed_variables_template,
+                        self._computed_variables_scope,
+                    )
+                ],
+                self._handle_computed_variables_result,
+                log_fn=log_fn,
+            )
+            self.async_on_remove(computed_result_info.async_remove)
+            self._computed_variables_result_info = computed_result_info
+            computed_result_info.async_refresh()
+
+        template_var_tups: list[TrackTemplate] = []
+        has_availability_template = False
+        self._log_fn = log_fn
+        player_variable_names = self._player_variable_names()
+        shared_templates: list[Template] = []
+
+        for template, attributes in self._template_attrs.items():
+            template_var_tup = TrackTemplate(template, self._template_variables)
+            if self._suspend_states and any(
+                attribute._attribute in self._attribute_templates
+                or attribute._attribute == "_attr_extra_state_attributes"
+                for attribute in attributes
+            ):
+                for attribute in attributes:
+                    attribute.async_setup()
+                self._attribute_track_templates.append(template_var_tup)
+                continue
+            if isinstance(template, ThrottledTemplate):
+                for attribute in attributes:
+                    attribute.async_setup()
+                throttled_result_info = self._async_track_throttled_template(
+                    template_var_tup, log_fn
+                )
+                self._throttled_result_infos.append(throttled_result_info)
+                self.async_on_remove(throttled_result_info.async_remove)
+                self.async_on_remove(template.async_cancel)
+                continue
+            if (
+                player_variable_names is not None
+                and type(template) is Template
+                and not template_variables(template.template) & player_variable_names
+            ):
+                for attribute in attributes:
+                    attribute.async_setup()
+                shared_templates.append(template)
+                continue
+            is_availability_template = False
+            for attribute in attributes:
+                if attribute._attribute == "_attr_available":
+                    has_availability_template = True
+                    is_availability_template = True
+                attribute.async_setup()
+            if is_availability_template:
+                template_var_tups.insert(0, template_var_tup)
+            else:
+                template_var_tups.append(template_var_tup)
+
+        defer_writes, self._defer_writes = self._defer_writes, True
+        try:
+            for template in shared_templates:
+                self.async_on_remove(
+                    async_get_coordinator(self.hass).async_track_template(
+                        template, self._handle_results, log_fn
+                    )
+                )
+        finally:
+            self._defer_writes = defer_writes
+
+        result_info = async_track_template_result(
+            self.hass,
+            template_var_tups,
+            self._handle_results,
+            log_fn=log_fn,
+            has_super_template=has_availability_template,
+        )
+        self.async_on_remove(result_info.async_remove)
+        self._template_result_info = result_info
+        result_info.async_refresh()
+
+        if shared_templates and not template_var_tups:
+            self.async_write_ha_state()
+
+        if self._attribute_track_templates:
+            self.async_on_remove(self._async_detach_attribute_templates)
+            if self._async_update_suspension():
+                self.async_write_ha_state()
+
+    def _player_variable_names(self) -> set[str] | None:
+        """Return the variables templates can read that depend on the player.
+
+        Templates that read none of them render the same for every player and
+        are tracked once for all players using them. Returns None if no template
+        of the player can be shared, because it has an availability template that
+        its other templates depend on.
+        """
+        if self._availability_template is not None:
+            return None
+
+        names = {
+            "this",
+            *self._script_variable_names(self._config),
+            *self._config.get(CONF_COMPUTED_VARIABLES, {}),
+        }
+
+        if self._global_template is not None:
+            names |= template_exports(self._global_template.template)
+
+        return names
+
+    @callback
+    def _async_track_throttled_template(
+        self,
+        track_template: TrackTemplate,
+        log_fn: Callable[[int, str], None] | None,
+    ) -> TrackTemplateResultInfo:
+        """Track a throttled template on its own, so it can be refreshed alone."""
+        template = cast(ThrottledTemplate, track_template.template)
+        result_info = async_track_template_result(
+            self.hass, [track_template], self._handle_results, log_fn=log_fn
+        )
+        template.refresh = result_info.async_refresh
+        result_info.async_refresh()
+        return result_info
+
+    @callback
+    def _async_update_suspension(self) -> bool:
+        """Detach or attach the attribute templates when the state changes.
+
+        Called with the results of the state and availability templates, before
+        the state is written. Returns whether the attribute templates were
+        detached or attached.
+        """
+        if not self._attribute_track_templates:
+            return False
+
+        suspended = (
+            STATE_UNAVAILABLE in self._suspend_states
+            if not self.available
+            else self._real_state in self._suspend_states
+        )
+
+        if suspended == self._attributes_suspended:
+            return False
+
+        self._attributes_suspended = suspended
+
+        if suspended:
+            self._async_detach_attribute_templates()
+        else:
+            self._async_attach_attribute_templates()
+
+        return True
+
+    @callback
+    def _async_attach_attribute_templates(self) -> None:
+        """Track the attribute templates and render them all once."""
+        track_templates: list[TrackTemplate] = []
+        defer_writes, self._defer_writes = self._defer_writes, True
+
+        try:
+            for track_template in self._attribute_track_templates:
+                if isinstance(track_template.template, ThrottledTemplate):
+                    self._attribute_result_infos.append(
+                        self._async_track_throttled_template(
+                            track_template, self._log_fn
+                        )
+                    )
+                else:
+                    track_templates.append(track_template)
+
+            if track_templates:
+                result_info = async_track_template_result(
+                    self.hass,
+                    track_templates,
+                    self._handle_results,
+                    log_fn=self._log_fn,
+                )
+                self._attribute_result_infos.append(result_info)
+                result_info.async_refresh()
+        finally:
+            self._defer_writes = defer_writes
+
+    @callback
+    def _async_detach_attribute_templates(self) -> None:
+        """Stop tracking the attribute templates and clear their values."""
+        for result_info in self._attribute_result_infos:
+            result_info.async_remove()
+        self._attribute_result_infos.clear()
+
+        for track_template in self._attribute_track_templates:
+            if isinstance(track_template.template, ThrottledTemplate):
+                track_template.template.async_cancel()
+
+            for attribute in self._template_attrs[track_template.template]:
+                if attribute._attribute == "_attr_extra_state_attributes":
+                    assert self._attribute_template_group is not None
+                    for key in self._attribute_template_group.templates:
+                        self._attr_extra_state_attributes.pop(key, None)
+                else:
+                    self._attr_extra_state_attributes.pop(attribute._attribute, None)
+
+    @callback
+    def _handle_global_template_result(
+        self,
+        event: Event[EventStateChangedData] | None,
+        updates: list[TrackTemplateResult],
+    ) -> None:
+        """Share the variables defined by the global template."""
+        result = updates[-1].result
+
+        if isinstance(result, TemplateError):
+            _LOGGER.error("Could not render global template: %s", result)
+
+        self._async_update_global_variables(result)
+
+    @callback
+    def _async_update_global_variables(
+        self, result: dict[str, Any] | TemplateError
+    ) -> None:
+        """Update the global variables and re-render all templates."""
+        self._global_variables = result if isinstance(result, dict) else {}
+        self._computed_variables_scope.clear()
+        self._computed_variables_scope.update(self._base_template_variables)
+        self._computed_variables_scope.update(self._global_variables)
+
+        if self._computed_variables_result_info is not None:
+            self._computed_variables_refreshed = False
+            self._computed_variables_result_info.async_refresh()
+            if self._computed_variables_refreshed:
+                return
+
+        self._async_refresh_templates()
+
+    @callback
+    def _handle_computed_variables_result(
+        self,
+        event: Event[EventStateChangedData] | None,
+        updates: list[TrackTemplateResult],
+    ) -> None:
+        """Share the computed variables with all other templates."""
+        result = updates[-1].result
+
+        if isinstance(result, TemplateError):
+            _LOGGER.error("Could not render computed variables: %s", result)
+
+        self._computed_variables = result if isinstance(result, dict) else {}
+        self._computed_variables_refreshed = True
+        self._async_refresh_templates()
+
+    @callback
+    def _async_refresh_templates(self) -> None:
+        """Update the template variables and re-render all templates."""
+        self._template_variables.clear()
+        self._template_variables.update(self._base_template_variables)
+        self._template_variables.update(self._global_variables)
+        self._template_variables.update(self._computed_variables)
+
+        if self._template_result_info is not None:
+            self._template_result_info.async_refresh()
+
+        for result_info in (
+            *self._throttled_result_infos,
+            *self._attribute_result_infos,
+        ):
+            result_info.async_refresh()
+
+    @callback
+    def _async_media_player_state_changed(
+        self, event: Event[EventStateChangedData]
+    ) -> None:
+        """Handle state changes of the referenced media players."""
+        entity_id = event.data["entity_id"]
+
+        if _is_placeholder(event.data["old_state"]) or _is_placeholder(
+            event.data["new_state"]
+        ):
+            self._media_player_entities.pop(entity_id, None)
+
+        changed = False
+
+        if entity_id in (
+            self._base_media_player_entity_id,
+            self._browse_media_entity_id,
+        ):
+            changed = self._async_update_base_supported_features()
+
+        if entity_id == self._base_media_player_entity_id:
+            changed = self._async_update_passthrough_attributes() or changed
+            if not self._state_template:
+                changed = self._async_update_suspension() or changed
+            if self._media_position is not None:
+                changed = self._async_update_media_position() or changed
+
+        if changed:
+            self.async_write_ha_state()
+
+        if (
+            self._browse_cache is not None
+            and entity_id
+            == (self._browse_media_entity_id or self._base_media_player_entity_id)
+            and _browse_state(event.data["old_state"])
+            != _browse_state(event.data["new_state"])
+        ):
+            self._browse_cache.clear()
+
+    @callback
+    def _async_media_player_registry_updated(
+        self, event: Event[EventEntityRegistryUpdatedData]
+    ) -> None:
+        """Forget all referenced media players when one is re-registered."""
+        self._media_player_entities.clear()
+        if self._browse_cache is not None:
+            self._browse_cache.clear()
+        if self._search_cache is not None:
+            self._search_cache.clear()
+        if self._async_update_base_supported_features():
+            self.async_write_ha_state()
+
+    @callback
+    def _async_clear_media_player_entities(self) -> None:
+        self._cache_media_player_entities = False
+        self._media_player_entities.clear()
+        self._base_supported_features = None
+        if self._browse_cache is not None:
+            self._browse_cache.clear()
+        if self._search_cache is not None:
+            self._search_cache.clear()
+
+    def _get_media_player_entity(
+        self, entity_id: str | None
+    ) -> MediaPlayerEntity | None:
+        """Return a media player entity, cached while its events are tracked."""
+        if not entity_id:
+            return None
+
+        if entity_id in self._media_player_entities:
+            return self._media_player_entities[entity_id]
+
+        component: EntityComponent[MediaPlayerEntity] = self.hass.data[
+            MEDIA_PLAYER_DOMAIN
+        ]
+        entity = component.get_entity(entity_id)
+
+        if self._cache_media_player_entities:
+            self._media_player_entities[entity_id] = entity
+
+        return entity
+
     @property
     def _base_media_player_entity(self) -> MediaPlayerEntity | None:
-        if self._base_media_player_entity_id:
-            component: EntityComponent[MediaPlayerEntity] = self.hass.data[
-                MEDIA_PLAYER_DOMAIN
-            ]
-            if entity := component.get_entity(self._base_media_player_entity_id):
-                return entity
-        return None
+        return self._get_media_player_entity(self._base_media_player_entity_id)
 
     @property
     def _browse_media_entity(self) -> MediaPlayerEntity | None:
-        if self._browse_media_entity_id:
-            component: EntityComponent[MediaPlayerEntity] = self.hass.data[
-                MEDIA_PLAYER_DOMAIN
-            ]
-            if entity := component.get_entity(self._browse_media_entity_id):
-                return entity
-        return None
+        return self._get_media_player_entity(self._browse_media_entity_id)
 
     @property
     def _search_media_entity(self) -> MediaPlayerEntity | None:
-        if self._search_media_entity_id:
-            component: EntityComponent[MediaPlayerEntity] = self.hass.data[
-                MEDIA_PLAYER_DOMAIN
-            ]
-            if entity := component.get_entity(self._search_media_entity_id):
-                return entity
-        return None
+        return self._get_media_player_entity(self._search_media_entity_id)
 
     @callback
     def _update_state(self, result: str | TemplateError) -> None:
@@ -230,14 +1527,29 @@ class TemplateMediaPlayer(TemplateEntity, MediaPlayerEntity):
         if isinstance(result, TemplateError):
             _LOGGER.error("Could not render state template: %s", result)
             self._state = None
+        else:
+            try:
+                self._state = MediaPlayerState(result)
+            except ValueError:
+                _LOGGER.error("Received invalid state: %s", result)
+                self._state = None
+
+        self._async_update_suspension()
+
+    @callback
+    def _update_available(self, result: str | TemplateError) -> None:
+        super()._update_available(result)
+        self._async_update_suspension()
+
+    @callback
+    def _update_attributes(self, result: dict[str, Any] | TemplateError) -> None:
+        if isinstance(result, TemplateError):
+            assert self._attribute_template_group is not None
+            for attribute in self._attribute_template_group.templates:
+                self._attr_extra_state_attributes[attribute] = None
             return
 
-        try:
-            state = MediaPlayerState(result)
-            self._state = state
-        except ValueError:
-            _LOGGER.error("Received invalid state: %s", result)
-            self._state = None
+        self._attr_extra_state_attributes.update(result)
 
     def add_template_attribute(
         self,
@@ -251,9 +1563,15 @@ class TemplateMediaPlayer(TemplateEntity, MediaPlayerEntity):
         if not template:
             return
 
-        template = Template(
-            "{% set attribute = '" + attribute + "' %}" + template.template, self.hass
-        )
+        if not isinstance(template, TemplateGroup):
+            template = self._create_template(
+                attribute,
+                "{% set attribute = '"
+                + attribute
+                + "' %}"
+                + self._global_template_prefix
+                + template.template,
+            )
 
         super().add_template_attribute(
             attribute,
@@ -276,10 +1594,14 @@ class TemplateMediaPlayer(TemplateEntity, MediaPlayerEntity):
     @property
     def supported_features(self) -> MediaPlayerEntityFeature:
         """Flag media player features that are supported."""
-        support = MediaPlayerEntityFeature(0)
+        if self._base_supported_features is None:
+            return self._script_supported_features | self._get_base_supported_features()
 
-        if self._base_media_player_entity:
-            support |= self._base_media_player_entity.supported_features
+        return self._script_supported_features | self._base_supported_features
+
+    def _get_script_supported_features(self) -> MediaPlayerEntityFeature:
+        """Return the features supported by the configured scripts."""
+        support = MediaPlayerEntityFeature(0)
 
         if CONF_MEDIA_PAUSE_SCRIPT in self._service_scripts:
             support |= MediaPlayerEntityFeature.PAUSE
@@ -297,14 +1619,14 @@ class TemplateMediaPlayer(TemplateEntity, MediaPlayerEntity):
             support |= MediaPlayerEntityFeature.TURN_ON
         if CONF_TURN_OFF_SCRIPT in self._service_scripts:
             support |= MediaPlayerEntityFeature.TURN_OFF
-        if CONF_PLAY_MEDIA_SCRIPT in self._service_scripts or self._browse_media_entity:
+        if CONF_PLAY_MEDIA_SCRIPT in self._service_scripts:
             support |= MediaPlayerEntityFeature.PLAY_MEDIA
         if (
             CONF_VOLUME_UP_SCRIPT in self._service_scripts
             and CONF_VOLUME_DOWN_SCRIPT in self._service_scripts
         ):
             support |= MediaPlayerEntityFeature.VOLUME_STEP
-        if len(self.source_list) > 0:
+        if self._source_scripts:
             support |= MediaPlayerEntityFeature.SELECT_SOURCE
         if CONF_MEDIA_STOP_SCRIPT in self._service_scripts:
             support |= MediaPlayerEntityFeature.STOP
@@ -314,7 +1636,7 @@ class TemplateMediaPlayer(TemplateEntity, MediaPlayerEntity):
             support |= MediaPlayerEntityFeature.PLAY
         if CONF_SHUFFLE_SET_SCRIPT in self._service_scripts:
             support |= MediaPlayerEntityFeature.SHUFFLE_SET
-        if len(self.sound_mode_list) > 0:
+        if self._sound_mode_scripts:
             support |= MediaPlayerEntityFeature.SELECT_SOUND_MODE
         if self._browse_media_entity_id:
             support |= MediaPlayerEntityFeature.BROWSE_MEDIA
@@ -328,9 +1650,51 @@ class TemplateMediaPlayer(TemplateEntity, MediaPlayerEntity):
 
         return support
 
+    def _get_base_supported_features(self) -> MediaPlayerEntityFeature:
+        """Return the features supported through the referenced media players."""
+        support = MediaPlayerEntityFeature(0)
+
+        if base_media_player_entity := self._base_media_player_entity:
+            support |= base_media_player_entity.supported_features
+
+            if not self._source_scripts and base_media_player_entity.source_list:
+                support |= MediaPlayerEntityFeature.SELECT_SOURCE
+            if (
+                not self._sound_mode_scripts
+                and base_media_player_entity.sound_mode_list
+            ):
+                support |= MediaPlayerEntityFeature.SELECT_SOUND_MODE
+
+        if self._browse_media_entity:
+            support |= MediaPlayerEntityFeature.PLAY_MEDIA
+
+        return support
+
+    @callback
+    def _async_update_base_supported_features(self) -> bool:
+        """Refresh the features supported through the referenced media players.
+
+        Returns whether the features changed.
+        """
+        supported_features = self._get_base_supported_features()
+
+        if supported_features == self._base_supported_features:
+            return False
+
+        self._base_supported_features = supported_features
+        return True
+
     @property
     def state(self) -> MediaPlayerState | None:
         """State of the player."""
+        if self._optimistic is not None and self._optimistic.state is not None:
+            return self._optimistic.state
+
+        return self._real_state
+
+    @property
+    def _real_state(self) -> MediaPlayerState | None:
+        """State of the player as reported by the template or base media player."""
         if self._state_template:
             return self._state
 
@@ -361,12 +1725,282 @@ class TemplateMediaPlayer(TemplateEntity, MediaPlayerEntity):
 
         return []
 
+    async def _async_run_service_script(
+        self, service: str, variables: dict[str, Any] | None = None
+    ) -> None:
+        """Run the script of a service, coalescing calls if configured."""
+        self._async_flush_coalescers(service)
+        self._async_update_optimistic(service, variables)
+
+        if coalescer := self._command_coalescers.get(service):
+            return await coalescer.async_call(variables or {})
+
+        return await self._async_execute_service_script(service, variables)
+
+    @callback
+    def _async_flush_coalescers(self, service: str) -> None:
+        """Run the merged calls of all other services, so calls keep their order."""
+        for coalesced_service, coalescer in self._command_coalescers.items():
+            if coalesced_service != service:
+                coalescer.async_flush()
+
+    async def _async_execute_service_script(
+        self, service: str, variables: dict[str, Any] | None = None
+    ) -> None:
+        """Run the script of a service."""
+        await self._async_run_script(service, self._service_scripts[service], variables)
+
+    async def _async_run_script(
+        self, service: str, script: Script, variables: dict[str, Any] | None = None
+    ) -> None:
+        """Run a script, in a background task if configured for the service."""
+        if service not in self._background_services:
+            await self._async_await_script(service, script, variables)
+            return
+
+        task = self.hass.async_create_background_task(
+            self._async_await_script(service, script, variables),
+            f"{self.entity_id} {service}",
+            eager_start=True,
+        )
+        self._background_tasks.add(task)
+        task.add_done_callback(
+            partial(self._async_background_script_done, service, time.perf_counter())
+        )
+
+    @callback
+    def _async_background_script_done(
+        self, service: str, start: float, task: asyncio.Task[None]
+    ) -> None:
+        """Log the outcome and duration of a script run in the background."""
+        self._background_tasks.discard(task)
+        duration = (time.perf_counter() - start) * 1000
+
+        if task.cancelled():
+            _LOGGER.debug(
+                "Script %s of %s was cancelled after %.1f ms",
+                service,
+                self.entity_id,
+                duration,
+            )
+        elif (err := task.exception()) is not None:
+            _LOGGER.error(
+                "Script %s of %s failed after %.1f ms: %s",
+                service,
+                self.entity_id,
+                duration,
+                err,
+            )
+        else:
+            _LOGGER.debug(
+                "Script %s of %s finished after %.1f ms",
+                service,
+                self.entity_id,
+                duration,
+            )
+
+    @callback
+    def _async_cancel_background_tasks(self) -> None:
+        """Cancel the scripts still running in the background."""
+        for task in self._background_tasks:
+            task.cancel()
+
+    async def _async_await_script(
+        self, service: str, script: Script, variables: dict[str, Any] | None = None
+    ) -> None:
+        """Run a script, recording its latency if statistics are enabled."""
+        if self._statistics is None:
+            await script.async_run(variables, context=self._context)
+            return
+
+        start = time.perf_counter()
+        try:
+            await script.async_run(variables, context=self._context)
+        finally:
+            self._statistics.scripts[service].record(time.perf_counter() - start)
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state to the state machine.
+
+        While templates are set up or attached their results are not written on
+        their own, as the state is written once they are all rendered.
+        """
+        if self._defer_writes:
+            return
+
+        if self._statistics is not None:
+            self._statistics.writes += 1
+
+        if self._media_position is not None:
+            self._async_update_media_position()
+
+        if self._optimistic is not None:
+            self._optimistic.async_reconcile(
+                self._real_state, self._real_extra_state_attributes or {}
+            )
+
+        super().async_write_ha_state()
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """Return the attributes of the base media player and the templates."""
+        if self._optimistic is not None and (attributes := self._optimistic.attributes):
+            return {**(self._real_extra_state_attributes or {}), **attributes}
+
+        return self._real_extra_state_attributes
+
+    @property
+    def _real_extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """Return the attributes as reported by the templates and base player."""
+        if not self._passthrough_attributes:
+            return super().extra_state_attributes
+
+        return {**self._passthrough_attributes, **self._attr_extra_state_attributes}
+
+    @callback
+    def _async_update_optimistic(
+        self, service: str, variables: dict[str, Any] | None
+    ) -> None:
+        """Publish the state and attributes a service is expected to result in."""
+        if self._optimistic is None:
+            return
+
+        state, attributes = expected_changes(service, variables or {}, self._real_state)
+        real_attributes = self._real_extra_state_attributes or {}
+
+        if self._optimistic.async_set(
+            state,
+            {
+                attribute: value
+                for attribute, value in attributes.items()
+                if attribute in real_attributes
+                or attribute in self._attribute_templates
+            },
+            self._real_state,
+            real_attributes,
+        ):
+            self.async_write_ha_state()
+
+    @callback
+    def _async_update_passthrough_attributes(self) -> bool:
+        """Copy the attributes without a template from the base media player.
+
+        Returns whether the copied attributes changed.
+        """
+        if not self._passthrough or not self._base_media_player_entity_id:
+            return False
+
+        base_state = self.hass.states.get(self._base_media_player_entity_id)
+        attributes = (
+            {
+                attribute: value
+                for attribute, value in base_state.attributes.items()
+                if attribute not in self._passthrough_excluded
+            }
+            if base_state is not None
+            else {}
+        )
+
+        if attributes == self._passthrough_attributes:
+            return False
+
+        self._passthrough_attributes = attributes
+        return True
+
+    @callback
+    def _async_update_media_position(self) -> bool:
+        """Publish the media position if it changed discontinuously.
+
+        The position is taken from the attribute templates if a media position
+        template is configured, otherwise from the base media player. Returns
+        whether the published position changed.
+        """
+        assert self._media_position is not None
+
+        for attribute in POSITION_ATTRIBUTES:
+            if attribute in self._attr_extra_state_attributes:
+                self._position_attributes[attribute] = (
+                    self._attr_extra_state_attributes.pop(attribute)
+                )
+
+        attributes: Mapping[str, Any] = self._position_attributes
+        if ATTR_MEDIA_POSITION not in self._attribute_templates:
+            base_state = (
+                self.hass.states.get(self._base_media_player_entity_id)
+                if self._base_media_player_entity_id
+                else None
+            )
+            attributes = base_state.attributes if base_state is not None else {}
+
+        track = self._attr_extra_state_attributes.get(
+            ATTR_MEDIA_CONTENT_ID, attributes.get(ATTR_MEDIA_CONTENT_ID)
+        ) or self._attr_extra_state_attributes.get(
+            ATTR_MEDIA_TITLE, attributes.get(ATTR_MEDIA_TITLE)
+        )
+
+        if not self._media_position.update(
+            self.state == MediaPlayerState.PLAYING,
+            attributes.get(ATTR_MEDIA_POSITION),
+            attributes.get(ATTR_MEDIA_POSITION_UPDATED_AT),
+            attributes.get(ATTR_MEDIA_DURATION),
+            track,
+        ):
+            return False
+
+        self._attr_media_position = (
+            int(self._media_position.position)
+            if self._media_position.position is not None
+            else None
+        )
+        self._attr_media_position_updated_at = self._media_position.updated_at
+        self._attr_media_duration = (
+            int(self._media_position.duration)
+            if self._media_position.duration is not None
+            else None
+        )
+        return True
+
+    async def async_get_statistics(self) -> ServiceResponse:
+        """Return the performance statistics of the media player.
+
+        The render, script and write statistics are only included if they are
+        collected, the counters of the caches, searches and coalesced commands
+        are always kept.
+        """
+        caches = {
+            name: cache.stats
+            for name, cache in (
+                (CONF_BROWSE_CACHE, self._browse_cache),
+                (CONF_SEARCH_CACHE, self._search_cache),
+                (CONF_RESOLVE_CACHE, self._resolve_cache),
+            )
+            if cache is not None
+        }
+
+        return {
+            **(self._statistics.as_dict() if self._statistics is not None else {}),
+            "interned": self._interner.as_dict(),
+            "dependencies": {
+                key: dependencies.as_dict()
+                for key, template in _player_templates(self._config).items()
+                if (dependencies := template_dependencies(template)) is not None
+            },
+            "caches": caches,
+            "shared_searches": self._search_flight.shared,
+            "coalesced": {
+                service: {
+                    "received": coalescer.received,
+                    "executed": coalescer.executed,
+                }
+                for service, coalescer in self._command_coalescers.items()
+            },
+        }
+
     async def async_media_next_track(self) -> None:
         """Send next track command."""
         if CONF_MEDIA_NEXT_TRACK_SCRIPT in self._service_scripts:
-            return await self._service_scripts[CONF_MEDIA_NEXT_TRACK_SCRIPT].async_run(
-                context=self._context
-            )
+            return await self._async_run_service_script(CONF_MEDIA_NEXT_TRACK_SCRIPT)
 
         if self._base_media_player_entity:
             return await self._base_media_player_entity.async_media_next_track()
@@ -376,9 +2010,7 @@ class TemplateMediaPlayer(TemplateEntity, MediaPlayerEntity):
     async def async_media_pause(self) -> None:
         """Send pause command."""
         if CONF_MEDIA_PAUSE_SCRIPT in self._service_scripts:
-            return await self._service_scripts[CONF_MEDIA_PAUSE_SCRIPT].async_run(
-                context=self._context
-            )
+            return await self._async_run_service_script(CONF_MEDIA_PAUSE_SCRIPT)
 
         if self._base_media_player_entity:
             return await self._base_media_player_entity.async_media_pause()
@@ -388,9 +2020,7 @@ class TemplateMediaPlayer(TemplateEntity, MediaPlayerEntity):
     async def async_media_play(self) -> None:
         """Send play command."""
         if CONF_MEDIA_PLAY_SCRIPT in self._service_scripts:
-            return await self._service_scripts[CONF_MEDIA_PLAY_SCRIPT].async_run(
-                context=self._context
-            )
+            return await self._async_run_service_script(CONF_MEDIA_PLAY_SCRIPT)
 
         if self._base_media_player_entity:
             return await self._base_media_player_entity.async_media_play()
@@ -400,9 +2030,7 @@ class TemplateMediaPlayer(TemplateEntity, MediaPlayerEntity):
     async def async_media_play_pause(self) -> None:
         """Play or pause the media player."""
         if CONF_MEDIA_PLAY_PAUSE_SCRIPT in self._service_scripts:
-            return await self._service_scripts[CONF_MEDIA_PLAY_PAUSE_SCRIPT].async_run(
-                context=self._context
-            )
+            return await self._async_run_service_script(CONF_MEDIA_PLAY_PAUSE_SCRIPT)
 
         if self._base_media_player_entity:
             return await self._base_media_player_entity.async_media_play_pause()
@@ -412,9 +2040,9 @@ class TemplateMediaPlayer(TemplateEntity, MediaPlayerEntity):
     async def async_media_previous_track(self) -> None:
         """Send previous track command."""
         if CONF_MEDIA_PREVIOUS_TRACK_SCRIPT in self._service_scripts:
-            return await self._service_scripts[
+            return await self._async_run_service_script(
                 CONF_MEDIA_PREVIOUS_TRACK_SCRIPT
-            ].async_run(context=self._context)
+            )
 
         if self._base_media_player_entity:
             return await self._base_media_player_entity.async_media_previous_track()
@@ -424,8 +2052,8 @@ class TemplateMediaPlayer(TemplateEntity, MediaPlayerEntity):
     async def async_media_seek(self, position: float) -> None:
         """Send seek command."""
         if CONF_MEDIA_SEEK_SCRIPT in self._service_scripts:
-            return await self._service_scripts[CONF_MEDIA_SEEK_SCRIPT].async_run(
-                {"position": position}, context=self._context
+            return await self._async_run_service_script(
+                CONF_MEDIA_SEEK_SCRIPT, {"position": position}
             )
 
         if self._base_media_player_entity:
@@ -436,9 +2064,7 @@ class TemplateMediaPlayer(TemplateEntity, MediaPlayerEntity):
     async def async_media_stop(self) -> None:
         """Send stop command."""
         if CONF_MEDIA_STOP_SCRIPT in self._service_scripts:
-            return await self._service_scripts[CONF_MEDIA_STOP_SCRIPT].async_run(
-                context=self._context
-            )
+            return await self._async_run_service_script(CONF_MEDIA_STOP_SCRIPT)
 
         if self._base_media_player_entity:
             return await self._base_media_player_entity.async_media_stop()
@@ -448,8 +2074,8 @@ class TemplateMediaPlayer(TemplateEntity, MediaPlayerEntity):
     async def async_set_repeat(self, repeat: RepeatMode) -> None:
         """Set repeat mode."""
         if CONF_REPEAT_SET_SCRIPT in self._service_scripts:
-            return await self._service_scripts[CONF_REPEAT_SET_SCRIPT].async_run(
-                {"repeat": repeat}, context=self._context
+            return await self._async_run_service_script(
+                CONF_REPEAT_SET_SCRIPT, {"repeat": repeat}
             )
 
         if self._base_media_player_entity:
@@ -460,8 +2086,8 @@ class TemplateMediaPlayer(TemplateEntity, MediaPlayerEntity):
     async def async_set_shuffle(self, shuffle: bool) -> None:
         """Enable/disable shuffle mode."""
         if CONF_SHUFFLE_SET_SCRIPT in self._service_scripts:
-            return await self._service_scripts[CONF_SHUFFLE_SET_SCRIPT].async_run(
-                {"shuffle": shuffle}, context=self._context
+            return await self._async_run_service_script(
+                CONF_SHUFFLE_SET_SCRIPT, {"shuffle": shuffle}
             )
 
         if self._base_media_player_entity:
@@ -472,9 +2098,7 @@ class TemplateMediaPlayer(TemplateEntity, MediaPlayerEntity):
     async def async_toggle(self) -> None:
         """Toggle the power on the media player."""
         if CONF_TOGGLE_SCRIPT in self._service_scripts:
-            return await self._service_scripts[CONF_TOGGLE_SCRIPT].async_run(
-                context=self._context
-            )
+            return await self._async_run_service_script(CONF_TOGGLE_SCRIPT)
 
         if self._base_media_player_entity:
             return await self._base_media_player_entity.async_toggle()
@@ -484,9 +2108,7 @@ class TemplateMediaPlayer(TemplateEntity, MediaPlayerEntity):
     async def async_turn_off(self) -> None:
         """Turn the media player off."""
         if CONF_TURN_OFF_SCRIPT in self._service_scripts:
-            return await self._service_scripts[CONF_TURN_OFF_SCRIPT].async_run(
-                context=self._context
-            )
+            return await self._async_run_service_script(CONF_TURN_OFF_SCRIPT)
 
         if self._base_media_player_entity:
             return await self._base_media_player_entity.async_turn_off()
@@ -496,9 +2118,7 @@ class TemplateMediaPlayer(TemplateEntity, MediaPlayerEntity):
     async def async_turn_on(self) -> None:
         """Turn the media player on."""
         if CONF_TURN_ON_SCRIPT in self._service_scripts:
-            return await self._service_scripts[CONF_TURN_ON_SCRIPT].async_run(
-                context=self._context
-            )
+            return await self._async_run_service_script(CONF_TURN_ON_SCRIPT)
 
         if self._base_media_player_entity:
             return await self._base_media_player_entity.async_turn_on()
@@ -508,8 +2128,8 @@ class TemplateMediaPlayer(TemplateEntity, MediaPlayerEntity):
     async def async_volume_down(self) -> None:
         """Turn volume down for media player."""
         if CONF_VOLUME_DOWN_SCRIPT in self._service_scripts:
-            return await self._service_scripts[CONF_VOLUME_DOWN_SCRIPT].async_run(
-                context=self._context
+            return await self._async_run_service_script(
+                CONF_VOLUME_DOWN_SCRIPT, {"steps": 1}
             )
 
         if self._base_media_player_entity:
@@ -520,8 +2140,8 @@ class TemplateMediaPlayer(TemplateEntity, MediaPlayerEntity):
     async def async_mute_volume(self, mute: bool) -> None:
         """Mute the volume."""
         if CONF_VOLUME_MUTE_SCRIPT in self._service_scripts:
-            return await self._service_scripts[CONF_VOLUME_MUTE_SCRIPT].async_run(
-                {"mute": mute}, context=self._context
+            return await self._async_run_service_script(
+                CONF_VOLUME_MUTE_SCRIPT, {"mute": mute}
             )
 
         if self._base_media_player_entity:
@@ -532,8 +2152,8 @@ class TemplateMediaPlayer(TemplateEntity, MediaPlayerEntity):
     async def async_set_volume_level(self, volume: float) -> None:
         """Set volume level, range 0..1."""
         if CONF_VOLUME_SET_SCRIPT in self._service_scripts:
-            return await self._service_scripts[CONF_VOLUME_SET_SCRIPT].async_run(
-                {"volume": volume}, context=self._context
+            return await self._async_run_service_script(
+                CONF_VOLUME_SET_SCRIPT, {"volume": volume}
             )
 
         if self._base_media_player_entity:
@@ -544,8 +2164,8 @@ class TemplateMediaPlayer(TemplateEntity, MediaPlayerEntity):
     async def async_volume_up(self) -> None:
         """Turn volume up for media player."""
         if CONF_VOLUME_UP_SCRIPT in self._service_scripts:
-            return await self._service_scripts[CONF_VOLUME_UP_SCRIPT].async_run(
-                context=self._context
+            return await self._async_run_service_script(
+                CONF_VOLUME_UP_SCRIPT, {"steps": 1}
             )
 
         if self._base_media_player_entity:
@@ -556,9 +2176,7 @@ class TemplateMediaPlayer(TemplateEntity, MediaPlayerEntity):
     async def async_clear_playlist(self) -> None:
         """Clear players playlist."""
         if CONF_CLEAR_PLAYLIST_SCRIPT in self._service_scripts:
-            return await self._service_scripts[CONF_CLEAR_PLAYLIST_SCRIPT].async_run(
-                context=self._context
-            )
+            return await self._async_run_service_script(CONF_CLEAR_PLAYLIST_SCRIPT)
 
         if self._base_media_player_entity:
             return await self._base_media_player_entity.async_clear_playlist()
@@ -568,8 +2186,8 @@ class TemplateMediaPlayer(TemplateEntity, MediaPlayerEntity):
     async def async_join_players(self, group_members: list[str]) -> None:
         """Join `group_members` as a player group with the current player."""
         if CONF_JOIN_SCRIPT in self._service_scripts:
-            return await self._service_scripts[CONF_JOIN_SCRIPT].async_run(
-                {"group_members": group_members}, context=self._context
+            return await self._async_run_service_script(
+                CONF_JOIN_SCRIPT, {"group_members": group_members}
             )
 
         if self._base_media_player_entity:
@@ -586,13 +2204,10 @@ class TemplateMediaPlayer(TemplateEntity, MediaPlayerEntity):
         if CONF_PLAY_MEDIA_SCRIPT in self._service_scripts:
             if is_media_source_id(media_id):
                 media_type = MediaType.MUSIC
-                play_item = await async_resolve_media(
-                    self.hass, media_id, self.entity_id
-                )
-                media_id = async_process_play_media_url(self.hass, play_item.url)
+                media_id = await self._async_resolve_media_url(media_id)
 
-            return await self._service_scripts[CONF_PLAY_MEDIA_SCRIPT].async_run(
-                {"media_type": media_type, "media_id": media_id}, context=self._context
+            return await self._async_run_service_script(
+                CONF_PLAY_MEDIA_SCRIPT, {"media_type": media_type, "media_id": media_id}
             )
 
         if self._browse_media_entity:
@@ -607,14 +2222,67 @@ class TemplateMediaPlayer(TemplateEntity, MediaPlayerEntity):
 
         return None
 
+    async def _async_resolve_media_url(self, media_id: str) -> str:
+        """Resolve a media source id to a playable URL."""
+        key = (media_id, self.entity_id)
+
+        if (
+            self._resolve_cache is not None
+            and (url := self._resolve_cache.get(key)) is not None
+        ):
+            return url
+
+        play_item = await async_resolve_media(self.hass, media_id, self.entity_id)
+        url = async_process_play_media_url(self.hass, play_item.url)
+
+        if self._resolve_cache is not None:
+            self._resolve_cache.set(key, url)
+
+        return url
+
+    @callback
+    def _async_pre_resolve_media(self, result: BrowseMedia) -> None:
+        """Resolve playable children of a browse result in the background."""
+        if (
+            self._resolve_cache is None
+            or CONF_PLAY_MEDIA_SCRIPT not in self._service_scripts
+        ):
+            return
+
+        media_ids = [
+            child.media_content_id
+            for child in result.children or ()
+            if child.can_play
+            and is_media_source_id(child.media_content_id)
+            and (child.media_content_id, self.entity_id) not in self._resolve_cache
+        ][: self._pre_resolve]
+
+        if media_ids:
+            self.hass.async_create_background_task(
+                self._async_resolve_media_urls(media_ids),
+                f"{self.entity_id} pre-resolve media",
+            )
+
+    async def _async_resolve_media_urls(self, media_ids: list[str]) -> None:
+        """Resolve media source ids one after another to fill the cache."""
+        for media_id in media_ids:
+            try:
+                await self._async_resolve_media_url(media_id)
+            except HomeAssistantError as err:
+                _LOGGER.debug("Could not pre-resolve %s: %s", media_id, err)
+
     async def async_select_sound_mode(self, sound_mode) -> None:
         """Select sound mode."""
         if sound_mode not in self.sound_mode_list:
             return None
 
         if self._sound_mode_scripts:
-            return await self._sound_mode_scripts[sound_mode].async_run(
-                context=self._context
+            self._async_flush_coalescers(CONF_SELECT_SOUND_MODE_SCRIPT)
+            self._async_update_optimistic(
+                CONF_SELECT_SOUND_MODE_SCRIPT, {"sound_mode": sound_mode}
+            )
+            return await self._async_run_script(
+                CONF_SELECT_SOUND_MODE_SCRIPT, self._sound_mode_scripts[sound_mode]
             )
 
         if self._base_media_player_entity:
@@ -630,7 +2298,11 @@ class TemplateMediaPlayer(TemplateEntity, MediaPlayerEntity):
             return None
 
         if self._source_scripts:
-            return await self._source_scripts[source].async_run(context=self._context)
+            self._async_flush_coalescers(CONF_SELECT_SOURCE_SCRIPT)
+            self._async_update_optimistic(CONF_SELECT_SOURCE_SCRIPT, {"source": source})
+            return await self._async_run_script(
+                CONF_SELECT_SOURCE_SCRIPT, self._source_scripts[source]
+            )
 
         if self._base_media_player_entity:
             return await self._base_media_player_entity.async_select_source(source)
@@ -640,9 +2312,7 @@ class TemplateMediaPlayer(TemplateEntity, MediaPlayerEntity):
     async def async_unjoin_player(self) -> None:
         """Remove this player from any group."""
         if CONF_UNJOIN_SCRIPT in self._service_scripts:
-            return await self._service_scripts[CONF_UNJOIN_SCRIPT].async_run(
-                context=self._context
-            )
+            return await self._async_run_service_script(CONF_UNJOIN_SCRIPT)
 
         if self._base_media_player_entity:
             return await self._base_media_player_entity.async_unjoin_player()
@@ -659,6 +2329,29 @@ class TemplateMediaPlayer(TemplateEntity, MediaPlayerEntity):
         The BrowseMedia instance will be used by the
         "media_player/browse_media" websocket command.
         """
+        key = (media_content_type, media_content_id)
+
+        if (
+            self._browse_cache is not None
+            and (result := self._browse_cache.get(key)) is not None
+        ):
+            return result
+
+        result = await self._async_browse_media(media_content_type, media_content_id)
+
+        if self._browse_cache is not None:
+            self._browse_cache.set(key, result)
+
+        self._async_pre_resolve_media(result)
+
+        return result
+
+    async def _async_browse_media(
+        self,
+        media_content_type: MediaType | str | None,
+        media_content_id: str | None,
+    ) -> BrowseMedia:
+        """Browse the browse media entity or the base media player."""
         if self._browse_media_entity:
             return await self._browse_media_entity.async_browse_media(
                 media_content_type, media_content_id
@@ -677,7 +2370,36 @@ class TemplateMediaPlayer(TemplateEntity, MediaPlayerEntity):
         self,
         query: SearchMediaQuery,
     ) -> SearchMedia:
-        """Search the media player."""
+        """Search the media player.
+
+        Identical queries in flight at the same time share a single search.
+        """
+        key = (
+            query.search_query,
+            query.media_content_type,
+            query.media_content_id,
+            tuple(query.media_filter_classes)
+            if query.media_filter_classes is not None
+            else None,
+        )
+
+        if (
+            self._search_cache is not None
+            and (result := self._search_cache.get(key)) is not None
+        ):
+            return result
+
+        result = await self._search_flight.async_call(
+            key, partial(self._async_search_media, query)
+        )
+
+        if self._search_cache is not None:
+            self._search_cache.set(key, result)
+
+        return result
+
+    async def _async_search_media(self, query: SearchMediaQuery) -> SearchMedia:
+        """Search the search media entity or the base media player."""
         if self._search_media_entity:
             return await self._search_media_entity.async_search_media(query)
 
@@ -687,3 +2409,29 @@ class TemplateMediaPlayer(TemplateEntity, MediaPlayerEntity):
         raise HomeAssistantError(
             "No search media entity configured for this template media player."
         )
+
+
+def _create_media_player(
+    hass: HomeAssistant, config: ConfigType, name: str
+) -> TemplateMediaPlayer:
+    """Create a template media player from its configuration."""
+    unrecorded_attributes = frozenset(
+        config.get(CONF_UNRECORDED_ATTRIBUTES, DEFAULT_UNRECORDED_ATTRIBUTES)
+    )
+    return _media_player_class(unrecorded_attributes)(hass, config, name)
+
+
+@cache
+def _media_player_class(
+    unrecorded_attributes: frozenset[str],
+) -> type[TemplateMediaPlayer]:
+    """Return the media player class excluding the attributes from the recorder.
+
+    The recorder reads the unrecorded attributes of an entity from its class,
+    so a subclass is created once for each configured set of attributes.
+    """
+
+    class UnrecordedTemplateMediaPlayer(TemplateMediaPlayer):
+        _unrecorded_attributes = unrecorded_attributes
+
+    return UnrecordedTemplateMediaPlayer
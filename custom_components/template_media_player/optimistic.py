@@ -0,0 +1,170 @@
+"""Optimistic state handling for the Template Media Player integration."""
+
+from collections.abc import Callable, Mapping
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.components.media_player.const import (
+    ATTR_INPUT_SOURCE,
+    ATTR_MEDIA_REPEAT,
+    ATTR_MEDIA_SHUFFLE,
+    ATTR_MEDIA_VOLUME_LEVEL,
+    ATTR_MEDIA_VOLUME_MUTED,
+    ATTR_SOUND_MODE,
+    MediaPlayerState,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    CONF_MEDIA_PAUSE_SCRIPT,
+    CONF_MEDIA_PLAY_PAUSE_SCRIPT,
+    CONF_MEDIA_PLAY_SCRIPT,
+    CONF_MEDIA_STOP_SCRIPT,
+    CONF_REPEAT_SET_SCRIPT,
+    CONF_SELECT_SOUND_MODE_SCRIPT,
+    CONF_SELECT_SOURCE_SCRIPT,
+    CONF_SHUFFLE_SET_SCRIPT,
+    CONF_TOGGLE_SCRIPT,
+    CONF_TURN_OFF_SCRIPT,
+    CONF_TURN_ON_SCRIPT,
+    CONF_VOLUME_MUTE_SCRIPT,
+    CONF_VOLUME_SET_SCRIPT,
+)
+
+EXPECTED_STATES: dict[str, MediaPlayerState] = {
+    CONF_MEDIA_PAUSE_SCRIPT: MediaPlayerState.PAUSED,
+    CONF_MEDIA_PLAY_SCRIPT: MediaPlayerState.PLAYING,
+    CONF_MEDIA_STOP_SCRIPT: MediaPlayerState.IDLE,
+    CONF_TURN_OFF_SCRIPT: MediaPlayerState.OFF,
+}
+
+EXPECTED_ATTRIBUTES: dict[str, tuple[str, str]] = {
+    CONF_REPEAT_SET_SCRIPT: ("repeat", ATTR_MEDIA_REPEAT),
+    CONF_SELECT_SOUND_MODE_SCRIPT: ("sound_mode", ATTR_SOUND_MODE),
+    CONF_SELECT_SOURCE_SCRIPT: ("source", ATTR_INPUT_SOURCE),
+    CONF_SHUFFLE_SET_SCRIPT: ("shuffle", ATTR_MEDIA_SHUFFLE),
+    CONF_VOLUME_MUTE_SCRIPT: ("mute", ATTR_MEDIA_VOLUME_MUTED),
+    CONF_VOLUME_SET_SCRIPT: ("volume", ATTR_MEDIA_VOLUME_LEVEL),
+}
+
+
+def expected_changes(
+    service: str, variables: Mapping[str, Any], state: MediaPlayerState | None
+) -> tuple[MediaPlayerState | None, dict[str, Any]]:
+    """Return the state and attributes a service is expected to result in."""
+    if service == CONF_MEDIA_PLAY_PAUSE_SCRIPT:
+        if state == MediaPlayerState.PLAYING:
+            return MediaPlayerState.PAUSED, {}
+        return MediaPlayerState.PLAYING, {}
+
+    if service == CONF_TOGGLE_SCRIPT:
+        if state == MediaPlayerState.OFF:
+            return MediaPlayerState.ON, {}
+        return MediaPlayerState.OFF, {}
+
+    if service == CONF_TURN_ON_SCRIPT:
+        if state == MediaPlayerState.OFF:
+            return MediaPlayerState.ON, {}
+        return None, {}
+
+    if service in EXPECTED_STATES:
+        return EXPECTED_STATES[service], {}
+
+    if service in EXPECTED_ATTRIBUTES:
+        variable, attribute = EXPECTED_ATTRIBUTES[service]
+        if variable in variables:
+            return None, {attribute: variables[variable]}
+
+    return None, {}
+
+
+class OptimisticState:
+    """State and attributes published before the templates report them.
+
+    Each expected value is kept until the real value changes, either to the
+    expected value or because the device reported something else, or until the
+    timeout expires, after which the real values are published again.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        timeout: timedelta,
+        on_expire: Callable[[], None],
+    ) -> None:
+        """Initialize the optimistic state."""
+        self.hass = hass
+        self.timeout = timeout.total_seconds()
+        self._on_expire = on_expire
+        self._state: tuple[MediaPlayerState, MediaPlayerState | None] | None = None
+        self._attributes: dict[str, tuple[Any, Any]] = {}
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @property
+    def state(self) -> MediaPlayerState | None:
+        """Return the expected state, or None if there is none."""
+        return self._state[0] if self._state is not None else None
+
+    @property
+    def attributes(self) -> dict[str, Any]:
+        """Return the expected attributes."""
+        return {
+            attribute: expected for attribute, (expected, _) in self._attributes.items()
+        }
+
+    @callback
+    def async_set(
+        self,
+        state: MediaPlayerState | None,
+        attributes: Mapping[str, Any],
+        real_state: MediaPlayerState | None,
+        real_attributes: Mapping[str, Any],
+    ) -> bool:
+        """Expect a state and attributes and return whether anything changed."""
+        changed = False
+
+        if state is not None and state != real_state:
+            self._state = (state, real_state)
+            changed = True
+
+        for attribute, expected in attributes.items():
+            if expected != (real := real_attributes.get(attribute)):
+                self._attributes[attribute] = (expected, real)
+                changed = True
+
+        if changed:
+            self.async_cancel()
+            self._unsub = async_call_later(self.hass, self.timeout, self._async_expire)
+
+        return changed
+
+    @callback
+    def async_reconcile(
+        self, real_state: MediaPlayerState | None, real_attributes: Mapping[str, Any]
+    ) -> None:
+        """Drop the expected values the real values have caught up with."""
+        if self._state is not None and real_state != self._state[1]:
+            self._state = None
+
+        for attribute, (_, previous) in list(self._attributes.items()):
+            if real_attributes.get(attribute) != previous:
+                del self._attributes[attribute]
+
+        if self._state is None and not self._attributes:
+            self.async_cancel()
+
+    @callback
+    def _async_expire(self, _now: datetime) -> None:
+        """Roll back to the real values."""
+        self._unsub = None
+        self._state = None
+        self._attributes.clear()
+        self._on_expire()
+
+    @callback
+    def async_cancel(self) -> None:
+        """Cancel the pending roll back."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
@@ -0,0 +1,64 @@
+"""Performance statistics for the Template Media Player integration."""
+
+from collections import defaultdict, deque
+import statistics
+from typing import Any
+
+SAMPLES = 1000
+
+
+class TimingStatistics:
+    """Count and duration of an operation, with percentiles of recent runs."""
+
+    def __init__(self) -> None:
+        """Initialize the timing statistics."""
+        self.count = 0
+        self.total = 0.0
+        self._samples: deque[float] = deque(maxlen=SAMPLES)
+
+    def record(self, duration: float) -> None:
+        """Record the duration of a run in seconds."""
+        self.count += 1
+        self.total += duration
+        self._samples.append(duration)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics in milliseconds."""
+        result: dict[str, Any] = {
+            "count": self.count,
+            "total_ms": self.total * 1000,
+        }
+
+        if len(self._samples) > 1:
+            quantiles = statistics.quantiles(self._samples, n=100)
+            result["p50_ms"] = quantiles[49] * 1000
+            result["p95_ms"] = quantiles[94] * 1000
+            result["p99_ms"] = quantiles[98] * 1000
+        elif self._samples:
+            result["p50_ms"] = result["p95_ms"] = result["p99_ms"] = (
+                self._samples[0] * 1000
+            )
+
+        return result
+
+
+class PlayerStatistics:
+    """Render, script and state write statistics of a template media player."""
+
+    def __init__(self) -> None:
+        """Initialize the player statistics."""
+        self.renders: defaultdict[str, TimingStatistics] = defaultdict(TimingStatistics)
+        self.scripts: defaultdict[str, TimingStatistics] = defaultdict(TimingStatistics)
+        self.writes = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics."""
+        return {
+            "renders": {
+                name: timing.as_dict() for name, timing in self.renders.items()
+            },
+            "scripts": {
+                name: timing.as_dict() for name, timing in self.scripts.items()
+            },
+            "writes": self.writes,
+        }
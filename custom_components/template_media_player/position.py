@@ -0,0 +1,96 @@
+"""Media position handling for the Template Media Player integration."""
+
+from datetime import datetime
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+TOLERANCE = 2.0
+
+
+def _as_float(value: Any) -> float | None:
+    """Return a value as a float, or None if it is not a number."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _as_datetime(value: Any) -> datetime | None:
+    """Return a value as a datetime, or None if it is not a timestamp."""
+    if isinstance(value, datetime):
+        return value
+
+    if isinstance(value, str):
+        return dt_util.parse_datetime(value)
+
+    return None
+
+
+class MediaPosition:
+    """Media position that is only updated on discontinuities.
+
+    Clients extrapolate the position of a playing player from the position and
+    the time it was updated at. A new observation is therefore only published
+    when it deviates from that extrapolation, or when the play state, the track or
+    the duration changes.
+    """
+
+    def __init__(self, tolerance: float = TOLERANCE) -> None:
+        """Initialize the media position."""
+        self.tolerance = tolerance
+        self.position: float | None = None
+        self.updated_at: datetime | None = None
+        self.duration: float | None = None
+        self._playing = False
+        self._track: Any = None
+
+    def update(
+        self,
+        playing: bool,
+        position: Any,
+        updated_at: Any,
+        duration: Any,
+        track: Any,
+    ) -> bool:
+        """Observe the current position and return whether it was published."""
+        observed_position = _as_float(position)
+        observed_at = _as_datetime(updated_at) or dt_util.utcnow()
+        observed_duration = _as_float(duration)
+
+        if observed_position is None:
+            changed = self.position is not None or self.duration != observed_duration
+            self.position = self.updated_at = None
+            self.duration = observed_duration
+            self._playing = playing
+            self._track = track
+            return changed
+
+        discontinuity = (
+            self.position is None
+            or self.updated_at is None
+            or playing != self._playing
+            or track != self._track
+            or observed_duration != self.duration
+            or abs(self._extrapolate(observed_at) - observed_position) > self.tolerance
+        )
+
+        self._playing = playing
+        self._track = track
+
+        if not discontinuity:
+            return False
+
+        self.position = observed_position
+        self.updated_at = observed_at
+        self.duration = observed_duration
+        return True
+
+    def _extrapolate(self, at: datetime) -> float:
+        """Return the position clients show at a point in time."""
+        assert self.position is not None and self.updated_at is not None
+
+        if not self._playing:
+            return self.position
+
+        return self.position + (at - self.updated_at).total_seconds()
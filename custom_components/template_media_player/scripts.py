@@ -0,0 +1,56 @@
+"""Script helpers for the Template Media Player integration."""
+
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from typing import Any
+
+from homeassistant.helpers.script import Script
+
+type ScriptFactory = Callable[[str, Sequence[dict[str, Any]]], Script]
+
+
+class LazyScripts(Mapping[str, Script]):
+    """Mapping of validated action sequences to scripts built on first access.
+
+    The keys are known from the configuration, so membership tests and listing
+    the keys never build a script.
+    """
+
+    def __init__(
+        self,
+        sequences: Mapping[str, Sequence[dict[str, Any]]],
+        factory: ScriptFactory,
+    ) -> None:
+        """Initialize the lazy scripts."""
+        self._sequences = sequences
+        self._factory = factory
+        self._scripts: dict[str, Script] = {}
+
+    def __getitem__(self, key: str) -> Script:
+        """Return the script for a key, building it if needed."""
+        if (script := self._scripts.get(key)) is None:
+            script = self._scripts[key] = self._factory(key, self._sequences[key])
+
+        return script
+
+    def __contains__(self, key: object) -> bool:
+        """Return whether a script is configured for a key."""
+        return key in self._sequences
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the configured keys."""
+        return iter(self._sequences)
+
+    def __len__(self) -> int:
+        """Return the number of configured scripts."""
+        return len(self._sequences)
+
+    @property
+    def built(self) -> int:
+        """Return the number of scripts that have been built."""
+        return len(self._scripts)
+
+    def warm_up(self) -> None:
+        """Build all scripts that have not been built yet."""
+        for key, sequence in self._sequences.items():
+            if key not in self._scripts:
+                self._scripts[key] = self._factory(key, sequence)
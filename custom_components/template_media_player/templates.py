@@ -0,0 +1,613 @@
+"""Template helpers for the Template Media Player integration."""
+
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from functools import lru_cache
+import logging
+import time
+from typing import Any
+
+from jinja2 import Environment, TemplateSyntaxError, meta, nodes
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback, valid_entity_id
+from homeassistant.exceptions import TemplateError
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.template import (
+    ALL_STATES_RATE_LIMIT,
+    DOMAIN_STATES_RATE_LIMIT,
+    RenderInfo,
+    Template,
+)
+
+from .performance import TimingStatistics
+
+_LOGGER = logging.getLogger(__name__)
+
+_ENVIRONMENT = Environment(extensions=["jinja2.ext.loopcontrols", "jinja2.ext.do"])
+
+
+@lru_cache(maxsize=1024)
+def template_variables(template: str) -> frozenset[str]:
+    """Return the names a template reads without defining them itself."""
+    return frozenset(meta.find_undeclared_variables(_ENVIRONMENT.parse(template)))
+
+
+@lru_cache(maxsize=256)
+def template_exports(template: str) -> frozenset[str]:
+    """Return the names a template defines with `set` statements and macros."""
+    ast = _ENVIRONMENT.parse(template)
+    names = {macro.name for macro in ast.find_all(nodes.Macro)}
+
+    targets: list[nodes.Expr] = [
+        *(assign.target for assign in ast.find_all(nodes.Assign)),
+        *(assign.target for assign in ast.find_all(nodes.AssignBlock)),
+    ]
+
+    for target in targets:
+        if isinstance(target, nodes.Name):
+            names.add(target.name)
+        else:
+            names.update(name.name for name in target.find_all(nodes.Name))
+
+    return frozenset(names)
+
+
+ITEM_FILTERS = frozenset({"map", "reject", "select"})
+
+STATE_FUNCTIONS = frozenset(
+    {
+        "expand",
+        "has_value",
+        "is_state",
+        "is_state_attr",
+        "state_attr",
+        "state_translated",
+        "states",
+    }
+)
+
+
+@dataclass(slots=True)
+class TemplateDependencies:
+    """Entities and domains a template reads, found without rendering it.
+
+    `all_states` is set if the template iterates or filters all states, which
+    makes Home Assistant re-render it on every state change, at most once per
+    minute. `iterated_domains` are the domains whose states it iterates or
+    filters, which makes it re-render on every state change in them, at most
+    once per second. `dynamic` is set if an entity id is computed while rendering
+    and can therefore only be determined by the tracker.
+    """
+
+    entities: set[str] = field(default_factory=set)
+    domains: set[str] = field(default_factory=set)
+    iterated_domains: set[str] = field(default_factory=set)
+    all_states: bool = False
+    dynamic: bool = False
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the dependencies as a dictionary."""
+        return {
+            "entities": sorted(self.entities),
+            "domains": sorted(self.domains),
+            "iterated_domains": sorted(self.iterated_domains),
+            "all_states": self.all_states,
+            "dynamic": self.dynamic,
+        }
+
+
+def template_dependencies(template: str) -> TemplateDependencies | None:
+    """Return the states a template reads, or None if it cannot be parsed.
+
+    String constants assigned with top level `set` statements are resolved, so
+    entity ids defined in the global template are attributed to the templates
+    that use them.
+    """
+    try:
+        ast = _ENVIRONMENT.parse(template)
+    except TemplateSyntaxError:
+        return None
+
+    constants: dict[str, list[str]] = {}
+    for assign in ast.find_all(nodes.Assign):
+        if isinstance(assign.target, nodes.Name) and (
+            values := _constant_strings(assign.node, {})
+        ):
+            constants[assign.target.name] = values
+
+    dependencies = TemplateDependencies()
+    _visit(ast, dependencies, constants)
+    return dependencies
+
+
+def _constant_strings(
+    node: nodes.Node, constants: dict[str, list[str]]
+) -> list[str] | None:
+    """Return the strings a node evaluates to, or None if it is not constant."""
+    if isinstance(node, nodes.Const) and isinstance(node.value, str):
+        return [node.value]
+
+    if isinstance(node, nodes.Name) and node.name in constants:
+        return constants[node.name]
+
+    if isinstance(node, (nodes.List, nodes.Tuple)):
+        values: list[str] = []
+        for item in node.items:
+            if (item_values := _constant_strings(item, constants)) is None:
+                return None
+            values.extend(item_values)
+        return values
+
+    return None
+
+
+def _is_states(node: nodes.Node) -> bool:
+    """Return whether a node is the `states` object."""
+    return isinstance(node, nodes.Name) and node.name == "states"
+
+
+def _is_states_lookup(node: nodes.Node) -> bool:
+    """Return whether a node is `states` or a domain or entity looked up in it."""
+    if _is_states(node):
+        return True
+
+    if not isinstance(node, (nodes.Getattr, nodes.Getitem)):
+        return False
+
+    return _is_states(node.node) or (
+        isinstance(node.node, nodes.Getattr) and _is_states(node.node.node)
+    )
+
+
+def _add_entities(
+    node: nodes.Node,
+    dependencies: TemplateDependencies,
+    constants: dict[str, list[str]],
+) -> None:
+    """Add the entity ids a node evaluates to, or mark the template dynamic."""
+    if (values := _constant_strings(node, constants)) is None:
+        if not _is_states_lookup(node):
+            dependencies.dynamic = True
+        _visit(node, dependencies, constants)
+        return
+
+    dependencies.entities.update(value for value in values if valid_entity_id(value))
+
+
+def _visit(
+    node: nodes.Node,
+    dependencies: TemplateDependencies,
+    constants: dict[str, list[str]],
+) -> None:
+    """Collect the states read by a node and its children."""
+    if isinstance(node, nodes.Getattr) and _is_states(node.node):
+        dependencies.domains.add(node.attr)
+        dependencies.iterated_domains.add(node.attr)
+        return
+
+    if (
+        isinstance(node, nodes.Getattr)
+        and isinstance(node.node, nodes.Getattr)
+        and _is_states(node.node.node)
+    ):
+        dependencies.entities.add(f"{node.node.attr}.{node.attr}")
+        return
+
+    if isinstance(node, nodes.Getitem) and _is_states(node.node):
+        if (values := _constant_strings(node.arg, constants)) is None:
+            dependencies.dynamic = True
+        else:
+            for value in values:
+                if "." in value:
+                    dependencies.entities.add(value)
+                else:
+                    dependencies.domains.add(value)
+                    dependencies.iterated_domains.add(value)
+        _visit(node.arg, dependencies, constants)
+        return
+
+    if (
+        isinstance(node, nodes.Getitem)
+        and isinstance(node.node, nodes.Getattr)
+        and _is_states(node.node.node)
+    ):
+        if (values := _constant_strings(node.arg, constants)) is None:
+            dependencies.domains.add(node.node.attr)
+        else:
+            dependencies.entities.update(
+                f"{node.node.attr}.{value}" for value in values
+            )
+        _visit(node.arg, dependencies, constants)
+        return
+
+    if (
+        isinstance(node, nodes.Call)
+        and isinstance(node.node, nodes.Name)
+        and node.node.name in STATE_FUNCTIONS
+    ):
+        if node.args:
+            _add_entities(node.args[0], dependencies, constants)
+        for arg in node.args[1:]:
+            _visit(arg, dependencies, constants)
+        for keyword in node.kwargs:
+            _visit(keyword, dependencies, constants)
+        return
+
+    if (
+        isinstance(node, (nodes.Filter, nodes.Test))
+        and node.name in STATE_FUNCTIONS
+        and node.node is not None
+    ):
+        _add_entities(node.node, dependencies, constants)
+        for arg in node.args:
+            _visit(arg, dependencies, constants)
+        return
+
+    if (
+        isinstance(node, nodes.Filter)
+        and node.name in ITEM_FILTERS
+        and node.node is not None
+        and node.args
+        and isinstance(function := node.args[0], nodes.Const)
+        and function.value in STATE_FUNCTIONS
+    ):
+        # Filters like `map('states')` call a state function with each item.
+        _add_entities(node.node, dependencies, constants)
+        for arg in node.args[1:]:
+            _visit(arg, dependencies, constants)
+        return
+
+    if _is_states(node):
+        dependencies.all_states = True
+        return
+
+    for child in node.iter_child_nodes():
+        _visit(child, dependencies, constants)
+
+
+def pin_render_info(info: RenderInfo, entity_ids: frozenset[str]) -> RenderInfo:
+    """Restrict the tracking of a rendered template to a fixed set of entities.
+
+    The domains and all states the template read are no longer listened to and
+    the rate limit Home Assistant applies to such templates is lifted.
+    """
+    if info.is_static or info.exception is not None:
+        return info
+
+    if (info.all_states or info.domains or info.domains_lifecycle) and (
+        info.rate_limit in (ALL_STATES_RATE_LIMIT, DOMAIN_STATES_RATE_LIMIT)
+    ):
+        info.rate_limit = None
+
+    info.all_states = info.all_states_lifecycle = False
+    info.domains = info.domains_lifecycle = frozenset()
+    info.entities = entity_ids
+    info.filter = entity_ids.__contains__
+    info.filter_lifecycle = _never
+    return info
+
+
+def _never(entity_id: str) -> bool:
+    """Return that an entity is never listened to."""
+    return False
+
+
+class GlobalTemplate(Template):
+    """Template that renders to the variables it defines.
+
+    The template is compiled once and its top level `set` statements, macros and
+    namespaces are returned as a dictionary, so they can be shared with all other
+    templates of an entity instead of being prepended to each of them.
+    """
+
+    __slots__ = ("entity_ids", "statistics")
+
+    def __init__(
+        self,
+        template: str,
+        hass: HomeAssistant | None = None,
+        statistics: TimingStatistics | None = None,
+        entity_ids: frozenset[str] | None = None,
+    ) -> None:
+        """Initialize the global template."""
+        super().__init__(template, hass)
+        self.statistics = statistics
+        self.entity_ids = entity_ids
+
+    def async_render_to_info(
+        self,
+        variables: Mapping[str, Any] | None = None,
+        strict: bool = False,
+        log_fn: Callable[[int, str], None] | None = None,
+        **kwargs: Any,
+    ) -> RenderInfo:
+        """Render the template and pin the entities it is tracked by if set."""
+        info = super().async_render_to_info(variables, strict, log_fn, **kwargs)
+
+        if self.entity_ids is None:
+            return info
+
+        return pin_render_info(info, self.entity_ids)
+
+    def async_render(
+        self,
+        variables: Mapping[str, Any] | None = None,
+        parse_result: bool = True,
+        limited: bool = False,
+        strict: bool = False,
+        log_fn: Callable[[int, str], None] | None = None,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """Render the template and return the variables it exports."""
+        self._renders += 1
+
+        if self.is_static:
+            return {}
+
+        if self.statistics is None:
+            return self._async_render(variables, limited, strict, log_fn, kwargs)
+
+        start = time.perf_counter()
+        try:
+            return self._async_render(variables, limited, strict, log_fn, kwargs)
+        finally:
+            self.statistics.record(time.perf_counter() - start)
+
+    def _async_render(
+        self,
+        variables: Mapping[str, Any] | None,
+        limited: bool,
+        strict: bool,
+        log_fn: Callable[[int, str], None] | None,
+        kwargs: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Make a module of the compiled template with the given variables."""
+        compiled = self._compiled or self._ensure_compiled(limited, strict, log_fn)
+
+        if variables is not None:
+            kwargs.update(variables)
+
+        try:
+            module = compiled.make_module(kwargs)
+        except Exception as err:
+            raise TemplateError(err) from err
+
+        return {
+            key: value for key, value in vars(module).items() if not key.startswith("_")
+        }
+
+
+class TemplateGroup(Template):
+    """Template that renders a group of attribute templates in a single pass.
+
+    The group is tracked as one template, so it listens for the union of the
+    entities referenced by its members and renders to a dictionary mapping each
+    attribute to the result of its template. The name of the attribute is passed
+    to each member as the `attribute` variable. All members are rendered when any
+    of the entities changes, so a group only saves work over tracking each member
+    on its own if the members share their entities.
+    """
+
+    __slots__ = ("_failed", "entity_ids", "templates")
+
+    member = "attribute"
+
+    def __init__(
+        self,
+        templates: dict[str, Template],
+        hass: HomeAssistant,
+        entity_ids: frozenset[str] | None = None,
+    ) -> None:
+        """Initialize the template group."""
+        super().__init__(
+            "\n".join(template.template for template in templates.values()), hass
+        )
+        self.templates = templates
+        self.entity_ids = entity_ids
+        self.is_static = False
+        self._failed: set[str] = set()
+
+    def async_render_to_info(
+        self,
+        variables: Mapping[str, Any] | None = None,
+        strict: bool = False,
+        log_fn: Callable[[int, str], None] | None = None,
+        **kwargs: Any,
+    ) -> RenderInfo:
+        """Render the group and pin the entities it is tracked by if set."""
+        info = super().async_render_to_info(variables, strict, log_fn, **kwargs)
+
+        if self.entity_ids is None:
+            return info
+
+        return pin_render_info(info, self.entity_ids)
+
+    def async_render(
+        self,
+        variables: Mapping[str, Any] | None = None,
+        parse_result: bool = True,
+        limited: bool = False,
+        strict: bool = False,
+        log_fn: Callable[[int, str], None] | None = None,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """Render all templates of the group."""
+        self._renders += 1
+
+        if variables is not None:
+            kwargs.update(variables)
+
+        results: dict[str, Any] = {}
+
+        for name, template in self.templates.items():
+            try:
+                results[name] = template.async_render(
+                    self._member_variables(name, kwargs),
+                    parse_result,
+                    limited,
+                    strict,
+                    log_fn,
+                )
+            except TemplateError as err:
+                if name not in self._failed:
+                    _LOGGER.error(
+                        "TemplateError('%s') while processing template '%s' "
+                        "for %s '%s'",
+                        err,
+                        template,
+                        self.member,
+                        name,
+                    )
+                self._failed.add(name)
+                results[name] = None
+            else:
+                self._failed.discard(name)
+
+        return results
+
+    def _member_variables(self, name: str, variables: dict[str, Any]) -> dict[str, Any]:
+        """Return the variables a member is rendered with."""
+        return {**variables, "attribute": name}
+
+
+class ComputedVariablesGroup(TemplateGroup):
+    """Template group that renders the computed variables of a player.
+
+    Computed variables do not belong to an attribute, so their templates are
+    rendered without the `attribute` variable.
+    """
+
+    __slots__ = ()
+
+    member = "computed variable"
+
+    def _member_variables(self, name: str, variables: dict[str, Any]) -> dict[str, Any]:
+        """Return the variables without an attribute name."""
+        return variables
+
+
+class TimedTemplate(Template):
+    """Template that records the duration of each render if statistics are set.
+
+    If entity ids are set, the template is only tracked by those entities instead
+    of the states it read while rendering.
+    """
+
+    __slots__ = ("entity_ids", "statistics")
+
+    def __init__(
+        self,
+        template: str,
+        hass: HomeAssistant,
+        statistics: TimingStatistics | None = None,
+        entity_ids: frozenset[str] | None = None,
+    ) -> None:
+        """Initialize the timed template."""
+        super().__init__(template, hass)
+        self.statistics = statistics
+        self.entity_ids = entity_ids
+
+    def async_render_to_info(
+        self,
+        variables: Mapping[str, Any] | None = None,
+        strict: bool = False,
+        log_fn: Callable[[int, str], None] | None = None,
+        **kwargs: Any,
+    ) -> RenderInfo:
+        """Render the template and pin the entities it is tracked by if set."""
+        info = super().async_render_to_info(variables, strict, log_fn, **kwargs)
+
+        if self.entity_ids is None:
+            return info
+
+        return pin_render_info(info, self.entity_ids)
+
+    def async_render(
+        self,
+        variables: Mapping[str, Any] | None = None,
+        parse_result: bool = True,
+        limited: bool = False,
+        strict: bool = False,
+        log_fn: Callable[[int, str], None] | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Render the template and record the duration."""
+        if self.statistics is None:
+            return super().async_render(
+                variables, parse_result, limited, strict, log_fn, **kwargs
+            )
+
+        start = time.perf_counter()
+        try:
+            return super().async_render(
+                variables, parse_result, limited, strict, log_fn, **kwargs
+            )
+        finally:
+            self.statistics.record(time.perf_counter() - start)
+
+
+class ThrottledTemplate(TimedTemplate):
+    """Template that renders at most once per interval.
+
+    A render requested within the interval returns the previous render info, so
+    the tracker sees an unchanged result. Once the interval has passed the
+    `refresh` callback is called, so the latest value is always delivered.
+    """
+
+    __slots__ = ("_last_info", "_last_render", "_unsub", "interval", "refresh")
+
+    def __init__(
+        self,
+        template: str,
+        hass: HomeAssistant,
+        interval: timedelta,
+        statistics: TimingStatistics | None = None,
+        entity_ids: frozenset[str] | None = None,
+    ) -> None:
+        """Initialize the throttled template."""
+        super().__init__(template, hass, statistics, entity_ids)
+        self.interval = interval.total_seconds()
+        self.refresh: Callable[[], None] | None = None
+        self._last_info: RenderInfo | None = None
+        self._last_render = 0.0
+        self._unsub: CALLBACK_TYPE | None = None
+
+    def async_render_to_info(
+        self,
+        variables: Mapping[str, Any] | None = None,
+        strict: bool = False,
+        log_fn: Callable[[int, str], None] | None = None,
+        **kwargs: Any,
+    ) -> RenderInfo:
+        """Render the template unless it was rendered within the interval."""
+        now = time.monotonic()
+        remaining = self._last_render + self.interval - now
+
+        if self._last_info is not None and remaining > 0:
+            if self._unsub is None and self.hass is not None:
+                self._unsub = async_call_later(
+                    self.hass, remaining, self._async_refresh
+                )
+            return self._last_info
+
+        self._last_render = now
+        self._last_info = super().async_render_to_info(
+            variables, strict, log_fn, **kwargs
+        )
+        return self._last_info
+
+    @callback
+    def _async_refresh(self, _now: datetime) -> None:
+        """Render the trailing value."""
+        self._unsub = None
+
+        if self.refresh is not None:
+            self.refresh()
+
+    @callback
+    def async_cancel(self) -> None:
+        """Cancel the pending trailing render."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
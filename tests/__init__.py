@@ -0,0 +1 @@
+"""Tests for the Template Media Player integration."""
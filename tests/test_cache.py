@@ -0,0 +1,54 @@
+"""Tests for the caches of the Template Media Player platform."""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from custom_components.template_media_player.cache import TTLCache
+
+
+def test_ttl_expiry() -> None:
+    """Test an entry expires after the time to live."""
+    cache: TTLCache[str, int] = TTLCache(2, timedelta(seconds=10))
+
+    with patch("time.monotonic", return_value=100.0):
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+
+    with patch("time.monotonic", return_value=109.0):
+        assert "a" in cache
+        assert cache.get("a") == 1
+
+    with patch("time.monotonic", return_value=110.0):
+        assert "a" not in cache
+        assert cache.get("a") is None
+
+    assert len(cache) == 0
+    assert cache.stats == {"hits": 2, "misses": 1, "size": 0}
+
+
+def test_lru_eviction() -> None:
+    """Test the least recently used entry is evicted when the cache is full."""
+    cache: TTLCache[str, int] = TTLCache(2, timedelta(minutes=5))
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats == {"hits": 3, "misses": 1, "size": 2}
+
+
+def test_clear() -> None:
+    """Test clearing removes all entries but keeps the counters."""
+    cache: TTLCache[str, int] = TTLCache(2, timedelta(minutes=5))
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+    cache.clear()
+
+    assert cache.get("a") is None
+    assert cache.stats == {"hits": 1, "misses": 1, "size": 0}
@@ -0,0 +1,33 @@
+"""Tests for the interning of the Template Media Player platform."""
+
+import gc
+
+from custom_components.template_media_player.interning import Interner
+from homeassistant.core import HomeAssistant
+
+
+async def test_unused_templates_dropped(hass: HomeAssistant) -> None:
+    """Test templates are dropped once no player uses them."""
+    interner = Interner(hass)
+    template = interner.template("{{ 1 }}")
+
+    assert interner.template("{{ 1 }}") is template
+    assert interner.as_dict()["templates"] == 1
+
+    del template
+    gc.collect()
+
+    assert interner.as_dict()["templates"] == 0
+
+
+async def test_prune_sequences(hass: HomeAssistant) -> None:
+    """Test pruning drops the script sequences not in use anymore."""
+    interner = Interner(hass)
+    used = [{"event": "used"}]
+    interner.sequence(used)
+    interner.sequence([{"event": "unused"}])
+
+    interner.prune([[{"event": "used"}]])
+
+    assert interner.as_dict()["sequences"] == 1
+    assert interner.sequence([{"event": "used"}]) is used
@@ -0,0 +1,1228 @@
+"""Tests for the Template Media Player platform."""
+
+import asyncio
+from datetime import timedelta
+from typing import Any
+from unittest.mock import ANY, patch
+
+import pytest
+import voluptuous as vol
+
+from custom_components.template_media_player.const import (
+    CONF_MEDIA_PLAYERS,
+    DOMAIN,
+    SERVICE_GET_STATISTICS,
+    SERVICE_SEND_COMMAND,
+)
+from custom_components.template_media_player.coordinator import async_get_coordinator
+from custom_components.template_media_player.media_player import TemplateMediaPlayer
+from homeassistant.components.media_player import MediaPlayerEntity
+from homeassistant.components.media_player.browse_media import (
+    BrowseMedia,
+    SearchMedia,
+    SearchMediaQuery,
+)
+from homeassistant.components.media_player.const import (
+    ATTR_MEDIA_DURATION,
+    ATTR_MEDIA_POSITION,
+    ATTR_MEDIA_POSITION_UPDATED_AT,
+    DOMAIN as MEDIA_PLAYER_DOMAIN,
+    MediaClass,
+    MediaPlayerEntityFeature,
+    MediaPlayerState,
+    MediaType,
+)
+from homeassistant.components.media_source import PlayMedia
+from homeassistant.const import CONF_PLATFORM, EVENT_STATE_CHANGED
+from homeassistant.core import (
+    Context,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
+)
+from homeassistant.helpers.entity_component import EntityComponent
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+
+
+class FakeMediaPlayer(MediaPlayerEntity):
+    """Base media player whose state is set by the tests."""
+
+    _attr_name = "Base"
+    _attr_state = MediaPlayerState.PLAYING
+    _attr_supported_features = MediaPlayerEntityFeature.PLAY
+
+    def __init__(self) -> None:
+        """Initialize the fake media player."""
+        self.browsed = 0
+        self.searched = 0
+
+    async def async_browse_media(
+        self,
+        media_content_type: MediaType | str | None = None,
+        media_content_id: str | None = None,
+    ) -> BrowseMedia:
+        """Return an empty library node."""
+        self.browsed += 1
+        return BrowseMedia(
+            media_class=MediaClass.DIRECTORY,
+            media_content_id=media_content_id or "root",
+            media_content_type=media_content_type or MediaType.MUSIC,
+            title="Library",
+            can_play=False,
+            can_expand=True,
+            children=[],
+        )
+
+    async def async_search_media(self, query: SearchMediaQuery) -> SearchMedia:
+        """Return no results after yielding to concurrent searches."""
+        self.searched += 1
+        await asyncio.sleep(0)
+        return SearchMedia(result=[])
+
+
+async def _async_get_statistics(hass: HomeAssistant, entity_id: str) -> dict[str, Any]:
+    """Return the statistics of a media player."""
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_STATISTICS,
+        target={"entity_id": entity_id},
+        blocking=True,
+        return_response=True,
+    )
+    assert response is not None
+    statistics = response[entity_id]
+    assert isinstance(statistics, dict)
+    return statistics
+
+
+async def _async_get_writes(hass: HomeAssistant, entity_id: str) -> int:
+    """Return the number of state writes of a media player."""
+    writes = (await _async_get_statistics(hass, entity_id))["writes"]
+    assert isinstance(writes, int)
+    return writes
+
+
+async def test_setup_without_attributes(hass: HomeAssistant) -> None:
+    """Test a media player without attribute templates is set up."""
+    assert await async_setup_component(
+        hass,
+        MEDIA_PLAYER_DOMAIN,
+        {
+            MEDIA_PLAYER_DOMAIN: {
+                CONF_PLATFORM: DOMAIN,
+                CONF_MEDIA_PLAYERS: {"living_room": {"state": "{{ 'playing' }}"}},
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    state = hass.states.get("media_player.template_media_player_living_room")
+    assert state is not None
+    assert state.state == "playing"
+
+
+async def test_passthrough_without_attributes(hass: HomeAssistant) -> None:
+    """Test a media player copies the attributes of its base without templates."""
+    hass.states.async_set(
+        "media_player.base",
+        "playing",
+        {"friendly_name": "Base", "source": "TV", "volume_level": 0.5},
+    )
+
+    assert await async_setup_component(
+        hass,
+        MEDIA_PLAYER_DOMAIN,
+        {
+            MEDIA_PLAYER_DOMAIN: {
+                CONF_PLATFORM: DOMAIN,
+                CONF_MEDIA_PLAYERS: {
+                    "living_room": {
+                        "state": "{{ states('media_player.base') }}",
+                        "base_media_player_entity_id": "media_player.base",
+                        "passthrough_attributes": True,
+                    }
+                },
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    state = hass.states.get("media_player.template_media_player_living_room")
+    assert state is not None
+    assert state.state == "playing"
+    assert state.attributes["source"] == "TV"
+    assert state.attributes["volume_level"] == 0.5
+    assert state.attributes.get("friendly_name") != "Base"
+
+
+async def test_suspend_states(hass: HomeAssistant) -> None:
+    """Test attribute templates are suspended in the configured states."""
+    hass.states.async_set("sensor.state", "off")
+    hass.states.async_set("sensor.title", "Song")
+
+    assert await async_setup_component(
+        hass,
+        MEDIA_PLAYER_DOMAIN,
+        {
+            MEDIA_PLAYER_DOMAIN: {
+                CONF_PLATFORM: DOMAIN,
+                CONF_MEDIA_PLAYERS: {
+                    "living_room": {
+                        "state": "{{ states('sensor.state') }}",
+                        "attributes": {"media_title": "{{ states('sensor.title') }}"},
+                        "suspend_states": ["off"],
+                        "statistics": True,
+                    }
+                },
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    entity_id = "media_player.template_media_player_living_room"
+    state = hass.states.get(entity_id)
+    assert state is not None
+    assert state.state == "off"
+    assert "media_title" not in state.attributes
+
+    writes = await _async_get_writes(hass, entity_id)
+    hass.states.async_set("sensor.state", "playing")
+    await hass.async_block_till_done()
+
+    state = hass.states.get(entity_id)
+    assert state is not None
+    assert state.state == "playing"
+    assert state.attributes["media_title"] == "Song"
+    assert await _async_get_writes(hass, entity_id) == writes + 1
+
+    hass.states.async_set("sensor.state", "off")
+    await hass.async_block_till_done()
+
+    state = hass.states.get(entity_id)
+    assert state is not None
+    assert state.state == "off"
+    assert "media_title" not in state.attributes
+
+
+async def test_send_command(hass: HomeAssistant) -> None:
+    """Test a command is sent only to the media players supporting it."""
+    assert await async_setup_component(
+        hass,
+        MEDIA_PLAYER_DOMAIN,
+        {
+            MEDIA_PLAYER_DOMAIN: {
+                CONF_PLATFORM: DOMAIN,
+                CONF_MEDIA_PLAYERS: {
+                    "living_room": {
+                        "state": "{{ 'playing' }}",
+                        "service_scripts": {
+                            "media_pause": _command_script(
+                                "media_pause", player="living_room"
+                            )
+                        },
+                    },
+                    "kitchen": {"state": "{{ 'playing' }}"},
+                },
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    events = _async_capture_commands(hass)
+    context = Context()
+    living_room = "media_player.template_media_player_living_room"
+    kitchen = "media_player.template_media_player_kitchen"
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SEND_COMMAND,
+        {"command": "media_pause"},
+        target={"entity_id": [living_room, kitchen]},
+        blocking=True,
+        return_response=True,
+        context=context,
+    )
+
+    assert response is not None
+    assert response["succeeded"] == 1
+    assert response["failed"] == 1
+    players = response["players"]
+    assert isinstance(players, dict)
+    assert players[kitchen] == {
+        "error": f"{kitchen} does not support media_pause",
+        "duration_ms": ANY,
+    }
+    assert [event.data["player"] for event in events] == ["living_room"]
+    assert events[0].context.id == context.id
+
+
+async def test_send_command_zero_timeout(hass: HomeAssistant) -> None:
+    """Test a command with a timeout of zero is rejected."""
+    assert await async_setup_component(
+        hass,
+        MEDIA_PLAYER_DOMAIN,
+        {
+            MEDIA_PLAYER_DOMAIN: {
+                CONF_PLATFORM: DOMAIN,
+                CONF_MEDIA_PLAYERS: {"living_room": {"state": "{{ 'playing' }}"}},
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    with pytest.raises(vol.Invalid):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SEND_COMMAND,
+            {"command": "media_pause", "timeout": 0},
+            target={"entity_id": "media_player.template_media_player_living_room"},
+            blocking=True,
+            return_response=True,
+        )
+
+
+async def test_warn_iterated_domain(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test a warning is logged for a name template iterating a domain."""
+    assert await async_setup_component(
+        hass,
+        MEDIA_PLAYER_DOMAIN,
+        {
+            MEDIA_PLAYER_DOMAIN: {
+                CONF_PLATFORM: DOMAIN,
+                CONF_MEDIA_PLAYERS: {
+                    "living_room": {
+                        "name": "{{ states.media_player | count }} players",
+                        "state": "{{ 'playing' }}",
+                    }
+                },
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    assert "Template name reads all states of the domains ['media_player']" in (
+        caplog.text
+    )
+
+
+async def test_shared_templates(hass: HomeAssistant) -> None:
+    """Test identical templates that do not depend on the player are shared."""
+    hass.states.async_set("sensor.title", "Song")
+
+    assert await async_setup_component(
+        hass,
+        MEDIA_PLAYER_DOMAIN,
+        {
+            MEDIA_PLAYER_DOMAIN: {
+                CONF_PLATFORM: DOMAIN,
+                CONF_MEDIA_PLAYERS: {
+                    name: {
+                        "state": "{{ 'playing' }}",
+                        "attributes": {
+                            "media_title": "{{ states('sensor.title') }}",
+                            "media_artist": "{{ this.entity_id }}",
+                        },
+                    }
+                    for name in ("living_room", "kitchen")
+                },
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    assert async_get_coordinator(hass).listeners == 2
+
+    hass.states.async_set("sensor.title", "Other Song")
+    await hass.async_block_till_done()
+
+    for name in ("living_room", "kitchen"):
+        entity_id = f"media_player.template_media_player_{name}"
+        state = hass.states.get(entity_id)
+        assert state is not None
+        assert state.attributes["media_title"] == "Other Song"
+        assert state.attributes["media_artist"] == entity_id
+
+
+async def test_global_template_reads_attribute(hass: HomeAssistant) -> None:
+    """Test a global template reading the attribute variable is prepended."""
+    hass.states.async_set("media_player.base", "playing", {"media_title": "T"})
+
+    assert await async_setup_component(
+        hass,
+        MEDIA_PLAYER_DOMAIN,
+        {
+            MEDIA_PLAYER_DOMAIN: {
+                CONF_PLATFORM: DOMAIN,
+                CONF_MEDIA_PLAYERS: {
+                    "living_room": {
+                        "global_template": (
+                            "{% set value = state_attr('media_player.base', "
+                            "attribute) %}"
+                        ),
+                        "state": "{{ states('media_player.base') }}",
+                        "attributes": {"media_title": "{{ value }}"},
+                    }
+                },
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    entity_id = "media_player.template_media_player_living_room"
+    state = hass.states.get(entity_id)
+    assert state is not None
+    assert state.attributes["media_title"] == "T"
+
+    hass.states.async_set("media_player.base", "playing", {"media_title": "U"})
+    await hass.async_block_till_done()
+
+    state = hass.states.get(entity_id)
+    assert state is not None
+    assert state.attributes["media_title"] == "U"
+
+
+async def test_batch_attributes(hass: HomeAssistant) -> None:
+    """Test batched attribute templates are all rendered on any change."""
+    hass.states.async_set("sensor.title", "Song")
+    hass.states.async_set("sensor.artist", "Band")
+
+    assert await async_setup_component(
+        hass,
+        MEDIA_PLAYER_DOMAIN,
+        {
+            MEDIA_PLAYER_DOMAIN: {
+                CONF_PLATFORM: DOMAIN,
+                CONF_MEDIA_PLAYERS: {
+                    "living_room": {
+                        "state": "{{ 'playing' }}",
+                        "attributes": {
+                            "media_title": "{{ states('sensor.title') }}",
+                            "media_artist": "{{ states('sensor.artist') }}",
+                        },
+                        "batch_attributes": True,
+                        "statistics": True,
+                    }
+                },
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    entity_id = "media_player.template_media_player_living_room"
+    statistics = await _async_get_statistics(hass, entity_id)
+    artist_renders = statistics["renders"]["media_artist"]["count"]
+    writes = statistics["writes"]
+
+    hass.states.async_set("sensor.title", "Other Song")
+    await hass.async_block_till_done()
+
+    state = hass.states.get(entity_id)
+    assert state is not None
+    assert state.attributes["media_title"] == "Other Song"
+    assert state.attributes["media_artist"] == "Band"
+
+    statistics = await _async_get_statistics(hass, entity_id)
+    assert statistics["renders"]["media_artist"]["count"] == artist_renders + 1
+    assert statistics["writes"] == writes + 1
+
+
+async def test_base_media_player_lookup_cached(hass: HomeAssistant) -> None:
+    """Test the base media player is looked up once until it is removed."""
+    assert await async_setup_component(
+        hass,
+        MEDIA_PLAYER_DOMAIN,
+        {
+            MEDIA_PLAYER_DOMAIN: {
+                CONF_PLATFORM: DOMAIN,
+                CONF_MEDIA_PLAYERS: {
+                    "base": {"state": "{{ 'paused' }}"},
+                    "living_room": {
+                        "base_media_player_entity_id": (
+                            "media_player.template_media_player_base"
+                        )
+                    },
+                },
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    component: EntityComponent[MediaPlayerEntity] = hass.data[MEDIA_PLAYER_DOMAIN]
+    base = component.get_entity("media_player.template_media_player_base")
+    living_room = component.get_entity("media_player.template_media_player_living_room")
+    assert isinstance(living_room, TemplateMediaPlayer)
+    assert base is not None
+
+    with patch.object(component, "get_entity", wraps=component.get_entity) as lookup:
+        assert living_room.state == "paused"
+        assert living_room.state == "paused"
+        assert lookup.call_count == 0
+
+    await base.async_remove()
+    await hass.async_block_till_done()
+
+    assert living_room.state is None
+
+
+async def test_base_supported_features_single_write(hass: HomeAssistant) -> None:
+    """Test a change of the base media player changes the state once."""
+    assert await async_setup_component(
+        hass,
+        MEDIA_PLAYER_DOMAIN,
+        {
+            MEDIA_PLAYER_DOMAIN: {
+                CONF_PLATFORM: DOMAIN,
+                CONF_MEDIA_PLAYERS: {
+                    "living_room": {
+                        "base_media_player_entity_id": "media_player.base",
+                        "passthrough_attributes": True,
+                    }
+                },
+            }
+        },
+    )
+    base = FakeMediaPlayer()
+    component: EntityComponent[MediaPlayerEntity] = hass.data[MEDIA_PLAYER_DOMAIN]
+    await component.async_add_entities([base])
+    await hass.async_block_till_done()
+
+    entity_id = "media_player.template_media_player_living_room"
+    events: list[Event[EventStateChangedData]] = []
+
+    @callback
+    def _async_state_changed(event: Event[EventStateChangedData]) -> None:
+        if event.data["entity_id"] == entity_id:
+            events.append(event)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _async_state_changed)
+
+    base._attr_supported_features |= MediaPlayerEntityFeature.PAUSE
+    base._attr_media_title = "Song"
+    base.async_write_ha_state()
+    await hass.async_block_till_done()
+
+    assert len(events) == 1
+    new_state = events[0].data["new_state"]
+    assert new_state is not None
+    assert new_state.attributes["media_title"] == "Song"
+    assert new_state.attributes["supported_features"] == (
+        MediaPlayerEntityFeature.PLAY | MediaPlayerEntityFeature.PAUSE
+    )
+
+
+def _command_script(service: str, **variables: str) -> list[dict[str, Any]]:
+    """Return a script firing a command event with the service and variables."""
+    return [{"event": "command", "event_data": {"service": service, **variables}}]
+
+
+@callback
+def _async_capture_commands(hass: HomeAssistant) -> list[Event]:
+    """Return a list the command events fired by scripts are added to."""
+    events: list[Event] = []
+
+    @callback
+    def _async_command(event: Event) -> None:
+        events.append(event)
+
+    hass.bus.async_listen("command", _async_command)
+    return events
+
+
+async def _async_setup_coalescing_player(hass: HomeAssistant) -> list[Event]:
+    """Set up a media player coalescing its volume commands.
+
+    Returns the command events fired by its scripts.
+    """
+    assert await async_setup_component(
+        hass,
+        MEDIA_PLAYER_DOMAIN,
+        {
+            MEDIA_PLAYER_DOMAIN: {
+                CONF_PLATFORM: DOMAIN,
+                CONF_MEDIA_PLAYERS: {
+                    "living_room": {
+                        "state": "{{ 'playing' }}",
+                        "service_scripts": {
+                            "volume_up": _command_script(
+                                "volume_up", steps="{{ steps }}"
+                            ),
+                            "volume_down": _command_script(
+                                "volume_down", steps="{{ steps }}"
+                            ),
+                            "volume_set": _command_script(
+                                "volume_set", volume="{{ volume }}"
+                            ),
+                            "volume_mute": _command_script("volume_mute"),
+                        },
+                        "service_options": {
+                            service: {"coalesce": {"milliseconds": 10}}
+                            for service in ("volume_up", "volume_set")
+                        },
+                        "statistics": True,
+                    }
+                },
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    return _async_capture_commands(hass)
+
+
+async def test_coalesce_commands(hass: HomeAssistant) -> None:
+    """Test a burst of commands is merged into a single script run."""
+    events = await _async_setup_coalescing_player(hass)
+    entity_id = "media_player.template_media_player_living_room"
+
+    await asyncio.gather(
+        *(
+            hass.services.async_call(
+                MEDIA_PLAYER_DOMAIN,
+                "volume_up",
+                target={"entity_id": entity_id},
+                blocking=True,
+            )
+            for _ in range(3)
+        ),
+        *(
+            hass.services.async_call(
+                MEDIA_PLAYER_DOMAIN,
+                "volume_set",
+                {"volume_level": volume_level},
+                target={"entity_id": entity_id},
+                blocking=True,
+            )
+            for volume_level in (0.2, 0.4)
+        ),
+    )
+    await hass.async_block_till_done()
+
+    assert sorted(
+        (event.data["service"], event.data.get("steps", event.data.get("volume")))
+        for event in events
+    ) == [("volume_set", 0.4), ("volume_up", 3)]
+
+    coalesced = (await _async_get_statistics(hass, entity_id))["coalesced"]
+    assert coalesced == {
+        "volume_up": {"received": 3, "executed": 1},
+        "volume_set": {"received": 2, "executed": 1},
+    }
+
+
+async def test_coalesce_flush_on_other_command(hass: HomeAssistant) -> None:
+    """Test merged commands are run before a command of another service."""
+    events = await _async_setup_coalescing_player(hass)
+    entity_id = "media_player.template_media_player_living_room"
+
+    await asyncio.gather(
+        *(
+            hass.services.async_call(
+                MEDIA_PLAYER_DOMAIN,
+                "volume_up",
+                target={"entity_id": entity_id},
+                blocking=True,
+            )
+            for _ in range(2)
+        ),
+        hass.services.async_call(
+            MEDIA_PLAYER_DOMAIN,
+            "volume_mute",
+            {"is_volume_muted": True},
+            target={"entity_id": entity_id},
+            blocking=True,
+        ),
+    )
+    await hass.async_block_till_done()
+
+    assert [event.data["service"] for event in events] == [
+        "volume_up",
+        "volume_mute",
+    ]
+    assert events[0].data["steps"] == 2
+
+
+async def test_script_modes(hass: HomeAssistant) -> None:
+    """Test service scripts run in their default or configured mode."""
+    delayed_script = [{"delay": {"milliseconds": 20}}, *_command_script("ran")]
+
+    assert await async_setup_component(
+        hass,
+        MEDIA_PLAYER_DOMAIN,
+        {
+            MEDIA_PLAYER_DOMAIN: {
+                CONF_PLATFORM: DOMAIN,
+                CONF_MEDIA_PLAYERS: {
+                    "living_room": {
+                        "state": "{{ 'playing' }}",
+                        "service_scripts": {
+                            "volume_set": delayed_script,
+                            "media_play": delayed_script,
+                        },
+                        "service_options": {
+                            "media_play": {"mode": "parallel", "max": 2}
+                        },
+                    }
+                },
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    events = _async_capture_commands(hass)
+    entity_id = "media_player.template_media_player_living_room"
+
+    await asyncio.gather(
+        *(
+            hass.services.async_call(
+                MEDIA_PLAYER_DOMAIN,
+                "volume_set",
+                {"volume_level": volume_level},
+                target={"entity_id": entity_id},
+                blocking=True,
+            )
+            for volume_level in (0.2, 0.4)
+        )
+    )
+    await hass.async_block_till_done()
+
+    assert len(events) == 1
+
+    await asyncio.gather(
+        *(
+            hass.services.async_call(
+                MEDIA_PLAYER_DOMAIN,
+                "media_play",
+                target={"entity_id": entity_id},
+                blocking=True,
+            )
+            for _ in range(2)
+        )
+    )
+    await hass.async_block_till_done()
+
+    assert len(events) == 3
+
+
+async def test_scripts_built_lazily(hass: HomeAssistant) -> None:
+    """Test the scripts of a media player are built when first called."""
+    assert await async_setup_component(
+        hass,
+        MEDIA_PLAYER_DOMAIN,
+        {
+            MEDIA_PLAYER_DOMAIN: {
+                CONF_PLATFORM: DOMAIN,
+                CONF_MEDIA_PLAYERS: {
+                    "living_room": {
+                        "state": "{{ 'playing' }}",
+                        "service_scripts": {
+                            "media_play": _command_script("media_play"),
+                            "media_pause": _command_script("media_pause"),
+                        },
+                    }
+                },
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    entity_id = "media_player.template_media_player_living_room"
+    component: EntityComponent[MediaPlayerEntity] = hass.data[MEDIA_PLAYER_DOMAIN]
+    media_player = component.get_entity(entity_id)
+    assert isinstance(media_player, TemplateMediaPlayer)
+    assert media_player._service_scripts.built == 0
+
+    await hass.services.async_call(
+        MEDIA_PLAYER_DOMAIN,
+        "media_play",
+        target={"entity_id": entity_id},
+        blocking=True,
+    )
+
+    assert media_player._service_scripts.built == 1
+
+
+async def test_browse_cache(hass: HomeAssistant) -> None:
+    """Test browse results are cached until the browsed entity changes."""
+    assert await async_setup_component(
+        hass,
+        MEDIA_PLAYER_DOMAIN,
+        {
+            MEDIA_PLAYER_DOMAIN: {
+                CONF_PLATFORM: DOMAIN,
+                CONF_MEDIA_PLAYERS: {
+                    "living_room": {
+                        "base_media_player_entity_id": "media_player.base",
+                        "browse_cache": {},
+                    }
+                },
+            }
+        },
+    )
+    base = FakeMediaPlayer()
+    component: EntityComponent[MediaPlayerEntity] = hass.data[MEDIA_PLAYER_DOMAIN]
+    await component.async_add_entities([base])
+    await hass.async_block_till_done()
+
+    entity_id = "media_player.template_media_player_living_room"
+    media_player = component.get_entity(entity_id)
+    assert isinstance(media_player, TemplateMediaPlayer)
+
+    await media_player.async_browse_media(MediaType.MUSIC, "root")
+    await media_player.async_browse_media(MediaType.MUSIC, "root")
+    assert base.browsed == 1
+
+    base._attr_supported_features |= MediaPlayerEntityFeature.SELECT_SOURCE
+    base._attr_source_list = ["TV", "Radio"]
+    base.async_write_ha_state()
+    await hass.async_block_till_done()
+
+    await media_player.async_browse_media(MediaType.MUSIC, "root")
+    assert base.browsed == 2
+
+    base._attr_state = MediaPlayerState.PAUSED
+    base.async_write_ha_state()
+    await hass.async_block_till_done()
+
+    await media_player.async_browse_media(MediaType.MUSIC, "root")
+    assert base.browsed == 3
+
+    statistics = await _async_get_statistics(hass, entity_id)
+    assert statistics["caches"] == {"browse_cache": {"hits": 1, "misses": 3, "size": 1}}
+    assert "writes" not in statistics
+
+
+async def test_concurrent_searches_shared(hass: HomeAssistant) -> None:
+    """Test identical searches in flight at the same time share one search."""
+    assert await async_setup_component(
+        hass,
+        MEDIA_PLAYER_DOMAIN,
+        {
+            MEDIA_PLAYER_DOMAIN: {
+                CONF_PLATFORM: DOMAIN,
+                CONF_MEDIA_PLAYERS: {
+                    "living_room": {"base_media_player_entity_id": "media_player.base"}
+                },
+            }
+        },
+    )
+    base = FakeMediaPlayer()
+    component: EntityComponent[MediaPlayerEntity] = hass.data[MEDIA_PLAYER_DOMAIN]
+    await component.async_add_entities([base])
+    await hass.async_block_till_done()
+
+    entity_id = "media_player.template_media_player_living_room"
+    media_player = component.get_entity(entity_id)
+    assert isinstance(media_player, TemplateMediaPlayer)
+
+    first, second = await asyncio.gather(
+        media_player.async_search_media(SearchMediaQuery(search_query="song")),
+        media_player.async_search_media(SearchMediaQuery(search_query="song")),
+    )
+
+    assert first is second
+    assert base.searched == 1
+
+    await media_player.async_search_media(SearchMediaQuery(search_query="song"))
+
+    assert base.searched == 2
+    assert (await _async_get_statistics(hass, entity_id))["shared_searches"] == 1
+
+
+def _state_players(**states: str) -> dict[str, Any]:
+    """Return the configuration of media players rendering the given sensors."""
+    return {
+        MEDIA_PLAYER_DOMAIN: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_MEDIA_PLAYERS: {
+                name: {"state": f"{{{{ states('{sensor}') }}}}"}
+                for name, sensor in states.items()
+            },
+        }
+    }
+
+
+async def test_reload(hass: HomeAssistant) -> None:
+    """Test a reload only rebuilds the media players whose configuration changed."""
+    for sensor in ("sensor.a", "sensor.b", "sensor.c", "sensor.d"):
+        hass.states.async_set(sensor, "playing")
+
+    assert await async_setup_component(
+        hass,
+        MEDIA_PLAYER_DOMAIN,
+        _state_players(kitchen="sensor.a", living_room="sensor.a", bedroom="sensor.c"),
+    )
+    await hass.async_block_till_done()
+
+    component: EntityComponent[MediaPlayerEntity] = hass.data[MEDIA_PLAYER_DOMAIN]
+    prefix = "media_player.template_media_player"
+    kitchen = component.get_entity(f"{prefix}_kitchen")
+    living_room = component.get_entity(f"{prefix}_living_room")
+    assert kitchen is not None
+    assert living_room is not None
+    assert async_get_coordinator(hass).listeners == 2
+
+    with patch(
+        "homeassistant.config.async_hass_config_yaml",
+        return_value=_state_players(
+            kitchen="sensor.a", living_room="sensor.b", office="sensor.d"
+        ),
+    ):
+        response = await hass.services.async_call(
+            DOMAIN, "reload", blocking=True, return_response=True
+        )
+    await hass.async_block_till_done()
+
+    assert response == {
+        "duration_ms": ANY,
+        "added": ["office"],
+        "reloaded": ["living_room"],
+        "removed": ["bedroom"],
+        "unchanged": 1,
+    }
+    assert component.get_entity(f"{prefix}_kitchen") is kitchen
+    assert component.get_entity(f"{prefix}_living_room") not in (None, living_room)
+    assert component.get_entity(f"{prefix}_bedroom") is None
+    assert component.get_entity(f"{prefix}_office") is not None
+    assert async_get_coordinator(hass).listeners == 3
+
+    for name in ("kitchen", "living_room", "office"):
+        state = hass.states.get(f"{prefix}_{name}")
+        assert state is not None
+        assert state.state == "playing"
+
+
+async def test_reload_unchanged(hass: HomeAssistant) -> None:
+    """Test a reload without changes keeps all media players."""
+    hass.states.async_set("sensor.a", "playing")
+    config = _state_players(kitchen="sensor.a", living_room="sensor.a")
+
+    assert await async_setup_component(hass, MEDIA_PLAYER_DOMAIN, config)
+    await hass.async_block_till_done()
+
+    component: EntityComponent[MediaPlayerEntity] = hass.data[MEDIA_PLAYER_DOMAIN]
+    entities = {entity.entity_id: entity for entity in component.entities}
+
+    with patch("homeassistant.config.async_hass_config_yaml", return_value=config):
+        response = await hass.services.async_call(
+            DOMAIN, "reload", blocking=True, return_response=True
+        )
+    await hass.async_block_till_done()
+
+    assert response is not None
+    assert response["unchanged"] == 2
+    assert {entity.entity_id: entity for entity in component.entities} == entities
+    assert async_get_coordinator(hass).listeners == 1
+
+
+async def test_resolve_cache(hass: HomeAssistant) -> None:
+    """Test a media source id is resolved once while its URL is cached."""
+    assert await async_setup_component(
+        hass,
+        MEDIA_PLAYER_DOMAIN,
+        {
+            MEDIA_PLAYER_DOMAIN: {
+                CONF_PLATFORM: DOMAIN,
+                CONF_MEDIA_PLAYERS: {
+                    "living_room": {
+                        "state": "{{ 'playing' }}",
+                        "service_scripts": {
+                            "play_media": _command_script(
+                                "play_media", media_id="{{ media_id }}"
+                            )
+                        },
+                        "resolve_cache": {},
+                    }
+                },
+            }
+        },
+    )
+    await hass.async_block_till_done()
+    events = _async_capture_commands(hass)
+
+    entity_id = "media_player.template_media_player_living_room"
+    media_id = "media-source://media_source/local/song.mp3"
+    module = "custom_components.template_media_player.media_player"
+
+    with (
+        patch(
+            f"{module}.async_resolve_media",
+            return_value=PlayMedia("/media/local/song.mp3", "audio/mpeg"),
+        ) as resolve_media,
+        patch(
+            f"{module}.async_process_play_media_url",
+            side_effect=lambda hass, url: f"http://example.local{url}",
+        ),
+    ):
+        for _ in range(2):
+            await hass.services.async_call(
+                MEDIA_PLAYER_DOMAIN,
+                "play_media",
+                {
+                    "entity_id": entity_id,
+                    "media_content_type": MediaType.MUSIC,
+                    "media_content_id": media_id,
+                },
+                blocking=True,
+            )
+        await hass.async_block_till_done()
+
+    assert resolve_media.call_count == 1
+    assert [event.data["media_id"] for event in events] == [
+        "http://example.local/media/local/song.mp3"
+    ] * 2
+
+    statistics = await _async_get_statistics(hass, entity_id)
+    assert statistics["caches"] == {
+        "resolve_cache": {"hits": 1, "misses": 1, "size": 1}
+    }
+
+
+async def test_native_position(hass: HomeAssistant) -> None:
+    """Test the position of the base media player is only published on jumps."""
+    assert await async_setup_component(
+        hass,
+        MEDIA_PLAYER_DOMAIN,
+        {
+            MEDIA_PLAYER_DOMAIN: {
+                CONF_PLATFORM: DOMAIN,
+                CONF_MEDIA_PLAYERS: {
+                    "living_room": {
+                        "base_media_player_entity_id": "media_player.base",
+                        "native_position": True,
+                    }
+                },
+            }
+        },
+    )
+    start = dt_util.utcnow()
+    base = FakeMediaPlayer()
+    base._attr_media_position = 10
+    base._attr_media_position_updated_at = start
+    base._attr_media_duration = 200
+    component: EntityComponent[MediaPlayerEntity] = hass.data[MEDIA_PLAYER_DOMAIN]
+    await component.async_add_entities([base])
+    await hass.async_block_till_done()
+
+    entity_id = "media_player.template_media_player_living_room"
+    state = hass.states.get(entity_id)
+    assert state is not None
+    assert state.attributes[ATTR_MEDIA_POSITION] == 10
+    assert state.attributes[ATTR_MEDIA_POSITION_UPDATED_AT] == start
+    assert state.attributes[ATTR_MEDIA_DURATION] == 200
+
+    base._attr_media_position = 15
+    base._attr_media_position_updated_at = start + timedelta(seconds=5)
+    base.async_write_ha_state()
+    await hass.async_block_till_done()
+
+    state = hass.states.get(entity_id)
+    assert state is not None
+    assert state.attributes[ATTR_MEDIA_POSITION] == 10
+    assert state.attributes[ATTR_MEDIA_POSITION_UPDATED_AT] == start
+
+    base._attr_media_position = 120
+    base._attr_media_position_updated_at = start + timedelta(seconds=6)
+    base.async_write_ha_state()
+    await hass.async_block_till_done()
+
+    state = hass.states.get(entity_id)
+    assert state is not None
+    assert state.attributes[ATTR_MEDIA_POSITION] == 120
+    assert state.attributes[ATTR_MEDIA_POSITION_UPDATED_AT] == start + timedelta(
+        seconds=6
+    )
+
+
+async def test_background_script(hass: HomeAssistant) -> None:
+    """Test a service call returns before a background script finishes."""
+    hass.states.async_set("input_boolean.ready", "off")
+    assert await async_setup_component(
+        hass,
+        MEDIA_PLAYER_DOMAIN,
+        {
+            MEDIA_PLAYER_DOMAIN: {
+                CONF_PLATFORM: DOMAIN,
+                CONF_MEDIA_PLAYERS: {
+                    "living_room": {
+                        "state": "{{ 'playing' }}",
+                        "service_scripts": {
+                            "turn_on": [
+                                {
+                                    "wait_template": "{{ is_state('input_boolean.ready', 'on') }}"
+                                },
+                                *_command_script("turn_on"),
+                            ]
+                        },
+                        "service_options": {"turn_on": {"background": True}},
+                    }
+                },
+            }
+        },
+    )
+    await hass.async_block_till_done()
+    events = _async_capture_commands(hass)
+
+    entity_id = "media_player.template_media_player_living_room"
+    await hass.services.async_call(
+        MEDIA_PLAYER_DOMAIN, "turn_on", {"entity_id": entity_id}, blocking=True
+    )
+
+    assert events == []
+
+    hass.states.async_set("input_boolean.ready", "on")
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert [event.data["service"] for event in events] == ["turn_on"]
+
+
+async def test_suspend_while_unavailable(hass: HomeAssistant) -> None:
+    """Test attribute templates are suspended while the player is unavailable."""
+    hass.states.async_set("binary_sensor.online", "off")
+    hass.states.async_set("sensor.title", "Song")
+
+    assert await async_setup_component(
+        hass,
+        MEDIA_PLAYER_DOMAIN,
+        {
+            MEDIA_PLAYER_DOMAIN: {
+                CONF_PLATFORM: DOMAIN,
+                CONF_MEDIA_PLAYERS: {
+                    "living_room": {
+                        "state": "{{ 'playing' }}",
+                        "availability": "{{ is_state('binary_sensor.online', 'on') }}",
+                        "attributes": {"media_title": "{{ states('sensor.title') }}"},
+                        "suspend_states": ["unavailable"],
+                        "statistics": True,
+                    }
+                },
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    entity_id = "media_player.template_media_player_living_room"
+    state = hass.states.get(entity_id)
+    assert state is not None
+    assert state.state == "unavailable"
+    assert async_get_coordinator(hass).listeners == 0
+
+    hass.states.async_set("binary_sensor.online", "on")
+    await hass.async_block_till_done()
+
+    state = hass.states.get(entity_id)
+    assert state is not None
+    assert state.state == "playing"
+    assert state.attributes["media_title"] == "Song"
+
+    component: EntityComponent[MediaPlayerEntity] = hass.data[MEDIA_PLAYER_DOMAIN]
+    media_player = component.get_entity(entity_id)
+    assert isinstance(media_player, TemplateMediaPlayer)
+
+    hass.states.async_set("binary_sensor.online", "off")
+    await hass.async_block_till_done()
+    statistics = await media_player.async_get_statistics()
+
+    hass.states.async_set("sensor.title", "Other")
+    await hass.async_block_till_done()
+
+    assert await media_player.async_get_statistics() == statistics
+
+    hass.states.async_set("binary_sensor.online", "on")
+    await hass.async_block_till_done()
+
+    state = hass.states.get(entity_id)
+    assert state is not None
+    assert state.attributes["media_title"] == "Other"
+
+
+async def test_unrecorded_attributes(hass: HomeAssistant) -> None:
+    """Test the configured attributes are excluded from the recorder."""
+    assert await async_setup_component(
+        hass,
+        MEDIA_PLAYER_DOMAIN,
+        {
+            MEDIA_PLAYER_DOMAIN: {
+                CONF_PLATFORM: DOMAIN,
+                CONF_MEDIA_PLAYERS: {
+                    name: {"state": "{{ 'playing' }}", **options}
+                    for name, options in (
+                        ("living_room", {}),
+                        ("kitchen", {}),
+                        ("bedroom", {"unrecorded_attributes": ["volume_level"]}),
+                    )
+                },
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    component: EntityComponent[MediaPlayerEntity] = hass.data[MEDIA_PLAYER_DOMAIN]
+    prefix = "media_player.template_media_player"
+    assert type(component.get_entity(f"{prefix}_kitchen")) is type(
+        component.get_entity(f"{prefix}_living_room")
+    )
+
+    state = hass.states.get(f"{prefix}_living_room")
+    assert state is not None
+    assert state.state_info is not None
+    unrecorded = state.state_info["unrecorded_attributes"]
+    assert {"media_summary", "extra", "entity_picture"} <= unrecorded
+    assert "volume_level" not in unrecorded
+
+    state = hass.states.get(f"{prefix}_bedroom")
+    assert state is not None
+    assert state.state_info is not None
+    unrecorded = state.state_info["unrecorded_attributes"]
+    assert {"volume_level", "entity_picture"} <= unrecorded
+    assert "media_summary" not in unrecorded
+
+
+async def test_computed_variables(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test computed variables are rendered on their own and shared."""
+    hass.states.async_set("sensor.volume", "40")
+    hass.states.async_set("sensor.bass", "loud")
+
+    assert await async_setup_component(
+        hass,
+        MEDIA_PLAYER_DOMAIN,
+        {
+            MEDIA_PLAYER_DOMAIN: {
+                CONF_PLATFORM: DOMAIN,
+                CONF_MEDIA_PLAYERS: {
+                    "living_room": {
+                        "state": "{{ 'playing' }}",
+                        "computed_variables": {
+                            "volume": "{{ states('sensor.volume') | float / 100 }}",
+                            "bass": "{{ states('sensor.bass') | float }}",
+                            "scope": "{{ 'attribute' if attribute is defined else 'player' }}",
+                        },
+                        "attributes": {
+                            "volume_level": "{{ volume }}",
+                            "media_title": "{{ scope }}",
+                        },
+                    }
+                },
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    entity_id = "media_player.template_media_player_living_room"
+    state = hass.states.get(entity_id)
+    assert state is not None
+    assert state.attributes["volume_level"] == 0.4
+    assert state.attributes["media_title"] == "player"
+    assert "for computed variable 'bass'" in caplog.text
+
+    hass.states.async_set("sensor.volume", "60")
+    await hass.async_block_till_done()
+
+    state = hass.states.get(entity_id)
+    assert state is not None
+    assert state.attributes["volume_level"] == 0.6
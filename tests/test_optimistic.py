@@ -0,0 +1,32 @@
+"""Tests for the optimistic state of the Template Media Player platform."""
+
+from custom_components.template_media_player.const import (
+    CONF_TOGGLE_SCRIPT,
+    CONF_TURN_ON_SCRIPT,
+)
+from custom_components.template_media_player.optimistic import expected_changes
+from homeassistant.components.media_player.const import MediaPlayerState
+
+
+def test_turn_on_from_off() -> None:
+    """Test turning on or toggling an off player is expected to turn it on."""
+    assert expected_changes(CONF_TURN_ON_SCRIPT, {}, MediaPlayerState.OFF) == (
+        MediaPlayerState.ON,
+        {},
+    )
+    assert expected_changes(CONF_TOGGLE_SCRIPT, {}, MediaPlayerState.OFF) == (
+        MediaPlayerState.ON,
+        {},
+    )
+
+
+def test_turn_on_from_idle() -> None:
+    """Test turning on an idle player expects no change and toggling turns it off."""
+    assert expected_changes(CONF_TURN_ON_SCRIPT, {}, MediaPlayerState.IDLE) == (
+        None,
+        {},
+    )
+    assert expected_changes(CONF_TOGGLE_SCRIPT, {}, MediaPlayerState.IDLE) == (
+        MediaPlayerState.OFF,
+        {},
+    )
@@ -0,0 +1,39 @@
+"""Tests for the media position of the Template Media Player platform."""
+
+from datetime import timedelta
+
+from custom_components.template_media_player.position import MediaPosition
+from homeassistant.util import dt as dt_util
+
+
+def test_extrapolated_position_not_published() -> None:
+    """Test a position following the extrapolation of clients is not published."""
+    start = dt_util.utcnow()
+    position = MediaPosition()
+
+    assert position.update(True, 10, start, 200, "song")
+    assert not position.update(True, 15, start + timedelta(seconds=5), 200, "song")
+    assert not position.update(True, 21.5, start + timedelta(seconds=10), 200, "song")
+
+    assert position.position == 10
+    assert position.updated_at == start
+
+
+def test_discontinuities_published() -> None:
+    """Test seeking, pausing and changing the track publish the position."""
+    start = dt_util.utcnow()
+    position = MediaPosition()
+    position.update(True, 10, start, 200, "song")
+
+    assert position.update(True, 100, start + timedelta(seconds=5), 200, "song")
+    assert position.position == 100
+
+    assert position.update(False, 101, start + timedelta(seconds=6), 200, "song")
+    assert not position.update(False, 101, start + timedelta(seconds=30), 200, "song")
+
+    assert position.update(False, 0, start + timedelta(seconds=31), 180, "other")
+    assert position.duration == 180
+
+    assert position.update(False, None, None, None, None)
+    assert position.position is None
+    assert position.updated_at is None
@@ -0,0 +1,38 @@
+"""Tests for the script helpers of the Template Media Player platform."""
+
+from collections.abc import Sequence
+from typing import Any
+
+from custom_components.template_media_player.scripts import LazyScripts
+from homeassistant.components.media_player.const import DOMAIN as MEDIA_PLAYER_DOMAIN
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.script import Script
+
+
+async def test_scripts_built_on_first_use(hass: HomeAssistant) -> None:
+    """Test a script is only built when it is first looked up."""
+    built: list[str] = []
+
+    def factory(key: str, sequence: Sequence[dict[str, Any]]) -> Script:
+        built.append(key)
+        return Script(hass, sequence, key, MEDIA_PLAYER_DOMAIN)
+
+    scripts = LazyScripts(
+        {"media_play": [{"event": "play"}], "media_pause": [{"event": "pause"}]},
+        factory,
+    )
+
+    assert "media_play" in scripts
+    assert list(scripts) == ["media_play", "media_pause"]
+    assert built == []
+
+    script = scripts["media_play"]
+
+    assert scripts["media_play"] is script
+    assert built == ["media_play"]
+    assert scripts.built == 1
+
+    scripts.warm_up()
+
+    assert built == ["media_play", "media_pause"]
+    assert scripts.built == 2
@@ -0,0 +1,45 @@
+"""Tests for the template helpers of the Template Media Player platform."""
+
+from custom_components.template_media_player.templates import template_dependencies
+
+
+def test_entity_dependencies() -> None:
+    """Test entities read by a template are found."""
+    dependencies = template_dependencies(
+        "{{ states('media_player.tv') }} {{ states.media_player.radio.state }}"
+    )
+
+    assert dependencies is not None
+    assert dependencies.entities == {"media_player.tv", "media_player.radio"}
+    assert not dependencies.iterated_domains
+    assert not dependencies.dynamic
+
+
+def test_iterated_domain() -> None:
+    """Test iterating the states of a domain is found."""
+    dependencies = template_dependencies("{{ states.media_player | list | count }}")
+
+    assert dependencies is not None
+    assert dependencies.iterated_domains == {"media_player"}
+    assert not dependencies.all_states
+
+
+def test_mapped_states() -> None:
+    """Test state functions mapped over entity ids are found."""
+    dependencies = template_dependencies(
+        "{{ ['media_player.tv', 'media_player.radio'] | map('states') | list }}"
+    )
+
+    assert dependencies is not None
+    assert dependencies.entities == {"media_player.tv", "media_player.radio"}
+    assert not dependencies.dynamic
+
+
+def test_mapped_area_entities() -> None:
+    """Test state functions mapped over computed entity ids are dynamic."""
+    dependencies = template_dependencies(
+        "{{ area_entities('Living Room') | select('is_state', 'on') | list }}"
+    )
+
+    assert dependencies is not None
+    assert dependencies.dynamic